@@ -0,0 +1,61 @@
+from fastapi import APIRouter, Depends
+
+from app.config import settings
+from app.core.dependencies.auth import Auth, FullAdminAuth
+from app.core.dependencies.database import init_engine, pool_monitor, read_pool_monitor
+from app.core.global_exc import CustomException
+from app.core.response import SuccessResponse
+from app.core.enums import UserType
+from app.crud.base import count_cache, statement_cache
+from app.utils.audit_writer import audit_writer
+from app.utils.login_recorder import login_recorder
+from app.utils.password_hasher import password_hasher
+from app.utils.query_advisor import query_advisor
+from app.utils.token_cache import token_cache
+from app.utils.user_cache import user_cache
+
+router = APIRouter(prefix="/system")
+
+
+def check_admin(auth: Auth) -> None:
+    """
+    仅管理员可访问，FullAdminAuth 目前不区分角色，这里按用户类型校验；关闭接口认证时不校验
+    """
+    if not settings.oauth_enable:
+        return
+    if auth.user is None or auth.user.user_type != UserType.ADMIN.value:
+        raise CustomException(status_code=403, code=403, msg="无权限操作")
+
+
+@router.get("/metrics")
+async def metrics(auth: Auth = Depends(FullAdminAuth())):
+    """
+    运行指标：哈希队列、连接池、各类缓存与后台写入，仅管理员可访问
+    """
+    check_admin(auth)
+    result = {
+        "password_hasher": password_hasher.stats(),
+        "token_cache": token_cache.stats(),
+        "user_cache": user_cache.stats(),
+        "count_cache": count_cache.stats(),
+        "statement_cache": statement_cache.stats(),
+        "audit_writer": audit_writer.stats(),
+        "login_recorder": login_recorder.stats(),
+        "query_advisor": query_advisor.stats(),
+        "db_pool": {
+            "primary": pool_monitor.stats(),
+            "read": read_pool_monitor.stats() if read_pool_monitor else None,
+        },
+    }
+    return SuccessResponse(data=result)
+
+
+@router.get("/query-plans")
+async def query_plans(auth: Auth = Depends(FullAdminAuth())):
+    """
+    对已执行过的查询执行 EXPLAIN，返回存在全表扫描、文件排序或临时表的语句，仅管理员可访问
+    """
+    check_admin(auth)
+    if not settings.query_advisor_enable:
+        raise CustomException(status_code=404, code=404, msg="未开启查询计划检查")
+    return SuccessResponse(data=await query_advisor.analyze(init_engine()))
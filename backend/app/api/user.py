@@ -1,9 +1,12 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.dependencies.database import db_getter
-from app.core.response import SuccessResponse
-from app.schemas.user import LoginIn, UserCreateIn
+from app.core.dependencies.auth import AllUserAuth, Auth
+from app.core.dependencies.database import db_getter, db_reader, session_factory
+from app.core.response import (SuccessResponse, NDJSONStreamResponse, CSVStreamResponse, build_validators,
+                               not_modified)
+from app.crud.user import UserDal
+from app.schemas.user import LoginIn, UserCreateIn, UserOut
 from app.services.user import UserService
 
 router = APIRouter(prefix="/user")
@@ -11,10 +14,11 @@ router = APIRouter(prefix="/user")
 
 @router.post("/login")
 async def login(
+        request: Request,
         data: LoginIn,
         db: AsyncSession = Depends(db_getter)
 ):
-    result = await UserService.login(db, data)
+    result = await UserService.login(db, data, request.client.host if request.client else "")
     return SuccessResponse(data=result, msg="登录成功")
 
 
@@ -25,3 +29,45 @@ async def register(
 ):
     result = await UserService.create_user(db, data)
     return SuccessResponse(data=result, msg="注册成功")
+
+
+@router.get("/info")
+async def info(auth: Auth = Depends(AllUserAuth())):
+    return SuccessResponse(data=UserOut.model_validate(auth.user))
+
+
+@router.get("/list")
+async def user_list(
+        request: Request,
+        page: int = Query(1, ge=1),
+        limit: int = Query(10, ge=1, le=100),
+        auth: Auth = Depends(AllUserAuth()),
+        reader: AsyncSession = Depends(db_reader)
+):
+    # 先查询数据版本，客户端缓存仍然有效时直接返回 304，不查询数据也不序列化
+    dal = UserDal(reader)
+    count, last_modified, max_id = await dal.get_version()
+    validators = build_validators((count, last_modified, max_id, page, limit), last_modified)
+    response = not_modified(request, validators)
+    if response is not None:
+        return response
+    datas = await dal.get_datas(page, limit, v_schema=UserOut, v_order="desc", v_projection=True)
+    response = SuccessResponse(data=datas, count=count)
+    response.headers.update(validators)
+    return response
+
+
+@router.get("/export")
+async def export(
+        fmt: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+        auth: Auth = Depends(AllUserAuth())
+):
+    async def rows():
+        # 流式响应在依赖清理之后才开始发送，因此使用独立的会话
+        async with session_factory() as session:
+            async for row in UserDal(session).stream_datas(v_order="desc", v_projection=True):
+                yield row
+
+    if fmt == "csv":
+        return CSVStreamResponse(rows(), filename="users.csv")
+    return NDJSONStreamResponse(rows(), filename="users.ndjson")
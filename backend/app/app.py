@@ -1,21 +1,64 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
 from app.config import settings
 from app.core.global_exc import register_exception
+from app.core.logger import setup_logging, shutdown_logging
 
 
 def register_routers(app: FastAPI) -> None:
-    from app.api import user
+    from app.api import user, system
     app.include_router(user.router, prefix=settings.prefix, tags=["用户"])
+    app.include_router(system.router, prefix=settings.prefix, tags=["系统"])
 
 
 def register_middleware(app: FastAPI) -> None:
-    from app.core.middlewares import init_cors_middleware
+    from app.core.middlewares import init_cors_middleware, init_profiling_middleware
     init_cors_middleware(app)
+    init_profiling_middleware(app)
+
+
+async def warm_up() -> None:
+    """
+    启动预热：建立连接池连接、加载 bcrypt 后端并启动哈希线程、构建常用的序列化校验器
+    """
+    from app.core.dependencies.database import warm_up_pool
+    from app.crud.base import get_list_adapter
+    from app.schemas.user import UserOut
+    from app.utils.password_hasher import password_hasher
+    await warm_up_pool(settings.db_pool_warmup)
+    await password_hasher.hash("warm-up")
+    get_list_adapter(UserOut)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    from app.core.dependencies.database import init_engine, dispose_engine
+    from app.utils.query_advisor import query_advisor
+    from app.utils.audit_writer import audit_writer
+    from app.utils.login_recorder import login_recorder
+    from app.utils.password_hasher import password_hasher
+    init_engine()
+    if settings.startup_warm_up:
+        await warm_up()
+    audit_writer.start()
+    login_recorder.start()
+    yield
+    # 写入剩余的操作记录与登录信息
+    await audit_writer.stop()
+    await login_recorder.stop()
+    password_hasher.shutdown()
+    if settings.query_advisor_enable:
+        await query_advisor.report(init_engine())
+    await dispose_engine()
+    shutdown_logging()
 
 
 def create_app() -> FastAPI:
-    app = FastAPI()
+    # 初始化日志
+    setup_logging()
+    app = FastAPI(lifespan=lifespan)
 
     # 注册中间件
     register_middleware(app)
@@ -9,16 +9,83 @@ class Settings(BaseSettings):
     host: str = "0.0.0.0"
     port: int = 8000
     debug: bool = True
+    # 工作进程数，0 表示与 CPU 核数相同
+    workers: int = 0
+    # 优雅退出时等待进行中请求完成的秒数
+    graceful_shutdown_timeout: int = 30
+    # 每个工作进程处理该数量的请求后退出并由主进程重新拉起，为空表示不重启
+    worker_max_requests: int | None = None
+    # 是否开启接口认证
+    oauth_enable: bool = True
+
+    # 日志级别；相同日志在 log_rate_interval 秒内最多输出 log_rate_limit 条，0 表示不限流
+    log_level: str = "INFO"
+    log_rate_limit: int = 10
+    log_rate_interval: float = 60
+
+    # 请求性能分析：Server-Timing 响应头与请求日志
+    profile_enable: bool = True
+    # 携带该请求头且值与 profile_token 一致时使用 cProfile 采样，未配置 profile_token 时不采样
+    profile_header: str = "X-Profile"
+    profile_token: str | None = None
+    # 同一 SQL 在一个请求中执行超过该次数时记录疑似 N+1 查询
+    n_plus_one_threshold: int = 10
+    # 查询计划检查（调试 / CI 使用）：收集执行过的查询，退出时或通过接口执行 EXPLAIN 报告全表扫描等问题
+    query_advisor_enable: bool = False
 
     # CORS 跨域资源共享
     cors_allow_origins: str = '["*"]'
 
     # MySQL 数据库连接，推荐用下面格式
     database_url: str
+    # 只读从库连接，格式同上，为空时读写都使用主库；测试时可指向另一个本地库或 SQLite 文件
+    database_read_url: str | None = None
+    # 数据库连接池，多 worker 部署时为每个进程的配置
+    db_pool_size: int = 5
+    db_max_overflow: int = 5
+    # 所有工作进程合计的最大连接数（每个数据库），多进程启动时据此按比例缩减每个进程的连接池
+    db_connection_budget: int | None = None
+    db_pool_recycle: int = 3600
+    db_pool_pre_ping: bool = True
+    db_pool_timeout: float = 30
+    # 获取连接等待超过该毫秒数时记录警告日志
+    db_pool_slow_wait_ms: int = 100
+    # 启动时预热：预先建立的连接数，同时预热密码哈希与序列化校验器
+    startup_warm_up: bool = True
+    db_pool_warmup: int = 2
+    # 列表总数缓存的存活秒数与条目上限，仅 cached/approximate 计数模式使用
+    count_cache_ttl: int = 10
+    count_cache_size: int = 1024
+    # 查询语句结构缓存的条目上限
+    statement_cache_size: int = 512
     # JWT
     jwt_secret_key: str
     jwt_algorithm: str = "HS256"
     jwt_token_expire_minutes: int = 60 * 24
+    # 已验证 token 的缓存条目上限
+    jwt_cache_size: int = 10000
+
+    # 密码哈希执行器：thread 线程池 / process 进程池
+    hash_executor: str = "thread"
+    # 同时进行哈希计算的最大数量
+    hash_max_workers: int = 4
+    # 允许排队等待哈希的最大请求数，超出后直接返回 503
+    hash_max_pending: int = 64
+
+    # 认证用户缓存：memory 进程内 / local_redis 本地 Redis 替身 / redis 共享 Redis
+    user_cache_backend: str = "memory"
+    user_cache_ttl: int = 60
+    redis_url: str | None = None
+
+    # 操作审计：请求体记录上限（字节），超出部分截断，超过上限的请求体不读取
+    audit_body_limit: int = 4096
+    # 审计写入队列长度、每批写入条数与最长写入间隔（秒）
+    audit_queue_size: int = 10000
+    audit_batch_size: int = 200
+    audit_flush_interval: float = 1.0
+
+    # 最后登录信息批量写入间隔（秒）
+    login_record_flush_interval: float = 5.0
 
     # OpenAI 配置
     openai_api_key: str | None = None
@@ -2,7 +2,6 @@ from fastapi import Request, Header, Depends
 
 import jwt
 from pydantic import BaseModel
-from sqlalchemy.orm import joinedload
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.config import settings
 from app.core.dependencies.database import db_getter
@@ -12,6 +11,10 @@ from starlette import status
 from app.crud.user import UserDal
 from app.models.user import User
 from app.core.enums import UserStatus
+from app.utils.audit_writer import audit_writer
+from app.utils.request_profile import phase
+from app.utils.token_cache import token_cache
+from app.utils.user_cache import user_cache
 
 
 class Auth(BaseModel):
@@ -32,6 +35,14 @@ class AuthValidation:
     error_code = status.HTTP_401_UNAUTHORIZED
     warning_code = status.HTTP_400_BAD_REQUEST
 
+    def __init__(self, audit: bool = False, audit_body_limit: int | None = None):
+        """
+        :param audit: 是否记录操作记录（含请求体），默认不读取请求体
+        :param audit_body_limit: 请求体记录上限（字节），默认取配置 audit_body_limit
+        """
+        self.audit = audit
+        self.audit_body_limit = audit_body_limit
+
     @classmethod
     def validate_token(cls, token: str | None) -> dict:
         """
@@ -43,6 +54,20 @@ class AuthValidation:
                 code=status.HTTP_403_FORBIDDEN,
                 status_code=status.HTTP_403_FORBIDDEN
             )
+        with phase("token"):
+            claims = token_cache.get(token)
+            if claims is None:
+                claims = cls.decode_token(token)
+                token_cache.set(token, claims)
+        if token_cache.is_revoked(token, claims):
+            raise CustomException(msg="无效认证，请您重新登录", code=cls.error_code, status_code=cls.error_code)
+        return claims
+
+    @classmethod
+    def decode_token(cls, token: str) -> dict:
+        """
+        解码并校验 token 签名与有效期
+        """
         try:
             return jwt.decode(token, settings.jwt_secret_key, algorithms=[settings.jwt_algorithm])
         except jwt.ExpiredSignatureError:
@@ -55,13 +80,30 @@ class AuthValidation:
             raise CustomException(msg="无效认证，请您重新登录", code=cls.error_code, status_code=cls.error_code)
 
     @classmethod
-    async def validate_user(cls, request: Request, user: User, db: AsyncSession, is_all: bool = True) -> Auth:
+    async def get_auth_user(cls, username: str, db: AsyncSession) -> User | None:
+        """
+        获取认证用户，优先读取缓存，未命中时查询主库并写入缓存
+        不读从库：复制延迟会把禁用、删除前的用户重新写入缓存，抵消写入时的缓存清除
+        """
+        with phase("auth"):
+            user = await user_cache.get(username)
+            if user is None:
+                user = await UserDal(db).get_data(username=username, v_return_none=True)
+                if user is not None:
+                    user = await user_cache.set(user)
+            return user
+
+    @classmethod
+    async def validate_user(cls, request: Request, user: User, db: AsyncSession, is_all: bool = True,
+                            audit: bool = False, audit_body_limit: int | None = None) -> Auth:
         """
         验证用户信息
         :param request:
         :param user:
         :param db:
         :param is_all: 是否所有人访问，不加权限
+        :param audit: 是否记录操作记录
+        :param audit_body_limit: 请求体记录上限
         :return:
         """
         if user is None:
@@ -71,10 +113,8 @@ class AuthValidation:
         request.scope["username"] = user.username
         request.scope["user_id"] = user.id
         request.scope["fullname"] = user.fullname
-        try:
-            request.scope["body"] = await request.body()
-        except RuntimeError:
-            request.scope["body"] = "获取失败"
+        if audit:
+            await audit_writer.record(request, user, audit_body_limit)
         if is_all:
             return Auth(user=user, db=db)
         data_range, dept_ids = await cls.get_user_data_range(user, db)
@@ -141,18 +181,18 @@ class OpenAuth(AuthValidation):
     async def __call__(
             self,
             request: Request,
-            token: Header(None),
+            token: str = Header(None),
             db: AsyncSession = Depends(db_getter)
     ):
         """
         每次调用依赖此类的接口会执行该方法
         """
-        if not settings.OAUTH_ENABLE:
+        if not settings.oauth_enable:
             return Auth(db=db)
         try:
             username = self.validate_token(token)["username"]
-            user = await UserDal(db).get_data(username=username, v_return_none=True)
-            return await self.validate_user(request, user, db, is_all=True)
+            user = await self.get_auth_user(username, db)
+            return await self.validate_user(request, user, db, True, self.audit, self.audit_body_limit)
         except CustomException:
             return Auth(db=db)
 
@@ -172,11 +212,11 @@ class AllUserAuth(AuthValidation):
         """
         每次调用依赖此类的接口会执行该方法
         """
-        if not settings.OAUTH_ENABLE:
+        if not settings.oauth_enable:
             return Auth(db=db)
         username = self.validate_token(token)["username"]
-        user = await UserDal(db).get_data(username=username, v_return_none=True)
-        return await self.validate_user(request, user, db, is_all=True)
+        user = await self.get_auth_user(username, db)
+        return await self.validate_user(request, user, db, True, self.audit, self.audit_body_limit)
 
 
 class FullAdminAuth(AuthValidation):
@@ -186,7 +226,9 @@ class FullAdminAuth(AuthValidation):
     如果有权限，那么会验证该用户是否包括权限列表中的其中一个权限
     """
 
-    def __init__(self, permissions: list[str] | None = None):
+    def __init__(self, permissions: list[str] | None = None, audit: bool = False,
+                 audit_body_limit: int | None = None):
+        super().__init__(audit, audit_body_limit)
         if permissions:
             self.permissions = set(permissions)
         else:
@@ -201,12 +243,11 @@ class FullAdminAuth(AuthValidation):
         """
         每次调用依赖此类的接口会执行该方法
         """
-        if not settings.OAUTH_ENABLE:
+        if not settings.oauth_enable:
             return Auth(db=db)
         username = self.validate_token(token)["username"]
-        options = [joinedload(SysUser.roles).subqueryload(SysRole.menus), joinedload(SysUser.depts)]
-        user = await UserDal(db).get_data(username=username, v_return_none=True, v_options=options)
-        result = await self.validate_user(request, user, db, is_all=False)
+        user = await self.get_auth_user(username, db)
+        result = await self.validate_user(request, user, db, False, self.audit, self.audit_body_limit)
         permissions = self.get_user_permissions(user)
         if permissions != {'*.*.*'} and self.permissions:
             if not (self.permissions & permissions):
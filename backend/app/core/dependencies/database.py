@@ -1,36 +1,161 @@
+import functools
 from typing import AsyncGenerator
 
 from sqlalchemy.orm import declarative_base
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession, AsyncEngine
 
 from app.config import settings
+from app.utils.pool_monitor import PoolMonitor
+from app.utils.query_advisor import query_advisor
+from app.utils.request_profile import register_engine_events
 
 Base = declarative_base()
 
-# 创建数据库连接
-async_engine = create_async_engine(
-    settings.database_url,
-    echo=False,
-    echo_pool=False,
-    pool_pre_ping=True,
-    pool_recycle=3600,
-    pool_size=5,
-    max_overflow=5,
-    connect_args={}
-)
+
+def build_engine(url: str, monitor: PoolMonitor = None):
+    engine = create_async_engine(
+        url,
+        echo=False,
+        echo_pool=False,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        pool_recycle=settings.db_pool_recycle,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        poolclass=monitor.pool_class() if monitor else None,
+        connect_args={}
+    )
+    if monitor:
+        monitor.attach(engine)
+    register_engine_events(engine)
+    if settings.query_advisor_enable:
+        query_advisor.attach(engine)
+    return engine
+
+
+# 连接池监控
+pool_monitor = PoolMonitor("primary", settings.db_pool_slow_wait_ms)
+read_pool_monitor = PoolMonitor("read", settings.db_pool_slow_wait_ms) if settings.database_read_url else None
+
+# 数据库引擎在应用启动（lifespan）时创建，导入模块时不建立任何连接
+async_engine: AsyncEngine | None = None
+async_read_engine: AsyncEngine | None = None
+
+
+class LazySessionMaker(async_sessionmaker):
+    """
+    会话工厂，引擎尚未创建时（脚本、迁移等不经过应用启动的场景）在首次创建会话时初始化
+    """
+
+    def __call__(self, **local_kw) -> AsyncSession:
+        if async_engine is None:
+            init_engine()
+        return super().__call__(**local_kw)
+
 
 # 创建数据库会话
-session_factory = async_sessionmaker(
+session_factory = LazySessionMaker(
     autocommit=False,
     autoflush=False,
-    bind=async_engine,
-    expire_on_commit=True,
+    expire_on_commit=False,
     class_=AsyncSession
 )
+read_session_factory = LazySessionMaker(
+    autocommit=False,
+    autoflush=False,
+    expire_on_commit=False,
+    class_=AsyncSession
+)
+
+
+def init_engine() -> AsyncEngine:
+    """
+    创建数据库引擎并绑定会话工厂，重复调用直接返回已创建的引擎
+    """
+    global async_engine, async_read_engine
+    if async_engine is None:
+        async_engine = build_engine(settings.database_url, pool_monitor)
+        # 只读（从库）连接，未配置时与主库共用同一个连接池
+        async_read_engine = build_engine(settings.database_read_url, read_pool_monitor) \
+            if settings.database_read_url else async_engine
+        session_factory.configure(bind=async_engine)
+        read_session_factory.configure(bind=async_read_engine)
+    return async_engine
+
+
+async def warm_up_pool(size: int) -> None:
+    """
+    预先建立连接池中的连接，避免启动后的首批请求承担建立连接的开销
+    """
+    engines = {init_engine(), async_read_engine}
+    for engine in engines:
+        connections = []
+        try:
+            for _ in range(min(size, settings.db_pool_size)):
+                connections.append(await engine.connect())
+        finally:
+            for connection in connections:
+                await connection.close()
+
+
+async def dispose_engine() -> None:
+    """
+    关闭连接池中的所有连接
+    """
+    global async_engine, async_read_engine
+    if async_engine is None:
+        return
+    if async_read_engine is not async_engine:
+        await async_read_engine.dispose()
+    await async_engine.dispose()
+    async_engine = async_read_engine = None
 
 
 async def db_getter() -> AsyncGenerator[AsyncSession, None]:
+    """
+    读写会话，首次查询时才开启事务并占用连接，
+    服务层可通过 release_session 提前提交并归还连接，请求结束时提交剩余的修改
+    """
     async with session_factory() as session:
-        # 创建一个新的事务，半自动 commit
-        async with session.begin():
+        try:
             yield session
+        except Exception:
+            await session.rollback()
+            raise
+        if session.in_transaction():
+            await session.commit()
+
+
+async def release_session(session: AsyncSession) -> None:
+    """
+    提交当前事务并把连接归还连接池，会话仍可继续使用，下次查询时重新获取连接
+    """
+    if session.in_transaction():
+        await session.commit()
+
+
+def auto_release(func):
+    """
+    服务层装饰器，第一个参数为会话，服务执行完成后立即提交并归还连接，
+    不必等到响应序列化、发送完成后依赖清理时才归还，异常时回滚
+    """
+
+    @functools.wraps(func)
+    async def wrapper(db: AsyncSession, *args, **kwargs):
+        try:
+            result = await func(db, *args, **kwargs)
+        except Exception:
+            await db.rollback()
+            raise
+        await release_session(db)
+        return result
+
+    return wrapper
+
+
+async def db_reader() -> AsyncGenerator[AsyncSession, None]:
+    """
+    只读会话，连接从库，首次查询时才占用连接，结束时回滚并归还
+    """
+    async with read_session_factory() as session:
+        yield session
@@ -1,16 +1,18 @@
 import logging
 
-from fastapi.responses import JSONResponse
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from fastapi.exceptions import RequestValidationError
 from starlette import status
 from fastapi import Request
-from fastapi.encoders import jsonable_encoder
 from fastapi import FastAPI
 
 from app.config import settings
+from app.core.logger import RateLimitFilter
+from app.core.response import ErrorResponse
 
 logger = logging.getLogger(__name__)
+# 异常日志限流，避免同一异常被大量请求触发时刷屏
+logger.addFilter(RateLimitFilter(settings.log_rate_limit, settings.log_rate_interval))
 
 
 class CustomException(Exception):
@@ -21,55 +23,47 @@ class CustomException(Exception):
         self.desc = desc
 
 
+def log_client_error(request: Request, handler: str, status_code: int, message, **extra) -> None:
+    """
+    记录 4xx 类异常，属于正常的业务/参数错误，不输出堆栈；debug 模式下附带详细信息
+    限流按 请求方法、路径、状态码、处理器 区分，不同接口的错误互不影响
+    """
+    logger.warning(
+        "%s %s %s", request.method, request.url.path, status_code,
+        extra={"handler": handler, "status_code": status_code, "error": message, **(extra if settings.debug else {})}
+    )
+
+
 def register_exception(app: FastAPI):
     @app.exception_handler(CustomException)
     async def custom_exception_handler(request: Request, exc: CustomException):
         """
         自定义异常
         """
-        if settings.debug:
-            print("请求地址", request.url.__str__())
-            print("捕捉到重写CustomException异常异常：custom_exception_handler")
-            print(exc.desc)
-            print(exc.msg)
-        # 打印栈信息，方便追踪排查异常
-        logger.exception(exc)
-        return JSONResponse(
-            status_code=exc.status_code,
-            content={"message": exc.msg, "code": exc.code},
-        )
+        if exc.status_code >= status.HTTP_500_INTERNAL_SERVER_ERROR:
+            # 服务端错误打印栈信息，方便追踪排查异常
+            logger.error(exc.msg, exc_info=exc, extra={"path": request.url.path, "desc": exc.desc})
+        else:
+            log_client_error(request, "custom_exception_handler", exc.status_code, exc.msg, desc=exc.desc)
+        return ErrorResponse(msg=exc.msg, code=exc.code, status=exc.status_code)
 
     @app.exception_handler(StarletteHTTPException)
     async def unicorn_exception_handler(request: Request, exc: StarletteHTTPException):
         """
         重写HTTPException异常处理器
         """
-        if settings.debug:
-            print("请求地址", request.url.__str__())
-            print("捕捉到重写HTTPException异常异常：unicorn_exception_handler")
-            print(exc.detail)
-        # 打印栈信息，方便追踪排查异常
-        logger.exception(exc)
-        return JSONResponse(
-            status_code=200,
-            content={
-                "code": status.HTTP_400_BAD_REQUEST,
-                "message": exc.detail,
-            }
-        )
+        log_client_error(request, "unicorn_exception_handler", exc.status_code, exc.detail)
+        return ErrorResponse(msg=exc.detail, code=status.HTTP_400_BAD_REQUEST, status=200)
 
     @app.exception_handler(RequestValidationError)
     async def validation_exception_handler(request: Request, exc: RequestValidationError):
         """
         重写请求验证异常处理器
         """
-        if settings.debug:
-            print("请求地址", request.url.__str__())
-            print("捕捉到重写请求验证异常异常：validation_exception_handler")
-            print(exc.errors())
-        # 打印栈信息，方便追踪排查异常
-        logger.exception(exc)
-        msg = exc.errors()[0].get("msg")
+        errors = exc.errors()
+        log_client_error(request, "validation_exception_handler", status.HTTP_400_BAD_REQUEST,
+                         errors[0].get("msg"), errors=errors)
+        msg = errors[0].get("msg")
         if msg == "Field required":
             msg = "请求失败，缺少必填项！"
         elif msg == "value is not a valid list":
@@ -80,55 +74,25 @@ def register_exception(app: FastAPI):
             msg = f"类型错误，提交参数应该为布尔值！"
         elif msg == "Input should be a valid list":
             msg = f"类型错误，输入应该是一个有效的列表！"
-        return JSONResponse(
-            status_code=200,
-            content=jsonable_encoder(
-                {
-                    "message": msg,
-                    "body": exc.body,
-                    "code": status.HTTP_400_BAD_REQUEST
-                }
-            ),
-        )
+        return ErrorResponse(msg=msg, code=status.HTTP_400_BAD_REQUEST, status=200)
 
     @app.exception_handler(ValueError)
     async def value_exception_handler(request: Request, exc: ValueError):
         """
         捕获值异常
         """
-        if settings.debug:
-            print("请求地址", request.url.__str__())
-            print("捕捉到值异常：value_exception_handler")
-            print(exc.__str__())
-        # 打印栈信息，方便追踪排查异常
-        logger.exception(exc)
-        return JSONResponse(
-            status_code=200,
-            content=jsonable_encoder(
-                {
-                    "message": exc.__str__(),
-                    "code": status.HTTP_400_BAD_REQUEST
-                }
-            ),
-        )
+        log_client_error(request, "value_exception_handler", status.HTTP_400_BAD_REQUEST, exc.__str__())
+        return ErrorResponse(msg=exc.__str__(), code=status.HTTP_400_BAD_REQUEST, status=200)
 
     @app.exception_handler(Exception)
     async def all_exception_handler(request: Request, exc: Exception):
         """
         捕获全部异常
         """
-        if settings.debug:
-            print("请求地址", request.url.__str__())
-            print("捕捉到全局异常：all_exception_handler")
-            print(exc.__str__())
         # 打印栈信息，方便追踪排查异常
-        logger.exception(exc)
-        return JSONResponse(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            content=jsonable_encoder(
-                {
-                    "message": "接口异常！",
-                    "code": status.HTTP_500_INTERNAL_SERVER_ERROR
-                }
-            ),
+        logger.error(exc, exc_info=exc, extra={"path": request.url.path, "handler": "all_exception_handler"})
+        return ErrorResponse(
+            msg="接口异常！",
+            code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
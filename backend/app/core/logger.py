@@ -0,0 +1,123 @@
+import logging
+import queue
+import sys
+import threading
+import time
+import traceback
+from logging.handlers import QueueHandler, QueueListener
+
+import orjson
+
+from app.config import settings
+
+# LogRecord 自带的属性，其余属性视为通过 extra 传入的结构化字段
+RESERVED_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    结构化 JSON 日志格式，extra 传入的字段原样输出，只有带 exc_info 的记录才输出堆栈
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "time": self.formatTime(record, "%Y-%m-%d %H:%M:%S"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in RESERVED_ATTRS:
+                data[key] = value
+        if record.exc_info:
+            data["traceback"] = "".join(traceback.format_exception(*record.exc_info))
+        return orjson.dumps(data, default=str).decode()
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    相同日志限流，同一日志、相同内容（格式化后的消息、状态码、处理器、异常类型）在 interval 秒内最多输出 limit 条，
+    超出的记录被丢弃，下一条输出的记录带上 suppressed 被丢弃的数量
+    只挂在异常处理的 logger 上，不影响其它日志
+    """
+
+    def __init__(self, limit: int = 10, interval: float = 60):
+        super().__init__()
+        self.limit = limit
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._windows: dict[tuple, list] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.limit <= 0:
+            return True
+        key = (
+            record.name,
+            record.levelno,
+            record.getMessage(),
+            getattr(record, "status_code", None),
+            getattr(record, "handler", None),
+            record.exc_info[0] if record.exc_info else None,
+        )
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= self.interval:
+                suppressed = window[2] if window else 0
+                self._windows[key] = [now, 1, 0]
+                if len(self._windows) > 10000:
+                    self._windows.clear()
+            elif window[1] < self.limit:
+                window[1] += 1
+                suppressed, window[2] = window[2], 0
+            else:
+                window[2] += 1
+                return False
+        if suppressed:
+            record.suppressed = suppressed
+        return True
+
+
+class LocalQueueHandler(QueueHandler):
+    """
+    进程内队列无需序列化，原样入队，消息与堆栈的格式化都在后台线程中完成
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+_listener: QueueListener | None = None
+_queue_handler: QueueHandler | None = None
+
+
+def setup_logging() -> None:
+    """
+    日志经由队列交给后台线程输出，请求线程只负责入队，不会阻塞在格式化与写 stdout 上
+    """
+    global _listener, _queue_handler
+    if _listener is not None:
+        return
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(JsonFormatter())
+    log_queue = queue.SimpleQueue()
+    _queue_handler = LocalQueueHandler(log_queue)
+
+    root = logging.getLogger()
+    root.setLevel(settings.log_level)
+    root.addHandler(_queue_handler)
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """
+    移除队列处理器，输出队列中剩余的日志并停止后台线程，之后可重新 setup_logging
+    """
+    global _listener, _queue_handler
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _queue_handler = None
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
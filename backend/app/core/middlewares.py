@@ -1,7 +1,22 @@
+import cProfile
+import hmac
+import io
+import logging
+import pstats
+import uuid
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.config import settings
+from app.utils.request_profile import RequestProfile, current_profile
+
+logger = logging.getLogger(__name__)
+
+# cProfile 同一线程内只能启用一个，事件循环中同一时间只采样一个请求
+_profiler_active = False
 
 
 def init_cors_middleware(app: FastAPI):
@@ -13,3 +28,78 @@ def init_cors_middleware(app: FastAPI):
         allow_methods=['OPTIONS', 'GET', 'POST', 'DELETE', 'PUT'],
         max_age=3600
     )
+
+
+class ProfilingMiddleware:
+    """
+    请求性能分析中间件
+    统计每个请求的阶段耗时、SQL 数量与耗时、连接池等待，通过 Server-Timing 响应头返回并记录结构化日志；
+    同一 SQL 执行次数超过阈值时记录疑似 N+1 查询；
+    请求头 X-Profile 的值与 profile_token 一致时使用 cProfile 采样并输出到日志，未配置 profile_token 时不采样，
+    已有请求正在采样时跳过
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.profile_header = settings.profile_header.lower().encode()
+
+    def allow_cprofile(self, scope: Scope) -> bool:
+        if not settings.profile_token or _profiler_active:
+            return False
+        for name, value in scope["headers"]:
+            if name == self.profile_header:
+                return hmac.compare_digest(value, settings.profile_token.encode())
+        return False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        global _profiler_active
+        profile = RequestProfile()
+        token = current_profile.set(profile)
+        profiler = cProfile.Profile() if self.allow_cprofile(scope) else None
+        profile_id = uuid.uuid4().hex[:12] if profiler else None
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", profile.server_timing())
+                if profile_id:
+                    headers.append("X-Profile-Id", profile_id)
+            await send(message)
+
+        if profiler:
+            _profiler_active = True
+            profiler.enable()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if profiler:
+                profiler.disable()
+                _profiler_active = False
+            current_profile.reset(token)
+            self.report(scope, status_code, profile, profiler, profile_id)
+
+    @staticmethod
+    def report(scope: Scope, status_code: int, profile: RequestProfile, profiler: cProfile.Profile | None,
+               profile_id: str | None) -> None:
+        extra = {"method": scope["method"], "path": scope["path"], "status_code": status_code, **profile.to_dict()}
+        logger.info("request %s %s", scope["method"], scope["path"], extra=extra)
+        repeated = profile.repeated_sql(settings.n_plus_one_threshold)
+        if repeated:
+            logger.warning("疑似 N+1 查询 %s %s", scope["method"], scope["path"], extra={"repeated_sql": repeated})
+        if profiler:
+            stream = io.StringIO()
+            pstats.Stats(profiler, stream=stream).sort_stats("cumulative").print_stats(40)
+            logger.info("cProfile %s", profile_id, extra={"profile_id": profile_id, "profile": stream.getvalue()})
+
+
+def init_profiling_middleware(app: FastAPI):
+    """初始化请求性能分析中间件"""
+    if settings.profile_enable:
+        app.add_middleware(ProfilingMiddleware)  # type: ignore
@@ -1,4 +1,56 @@
-from fastapi.responses import ORJSONResponse as Response
+import codecs
+import csv
+import datetime
+import hashlib
+import io
+from decimal import Decimal
+from email.utils import format_datetime
+from typing import Any, AsyncIterable, AsyncIterator
+
+import orjson
+from fastapi import Request
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy.engine import Row, RowMapping
+
+from app.utils.request_profile import phase
+
+OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def encode_default(obj: Any) -> Any:
+    """
+    orjson 无法直接处理的类型，pydantic 模型、查询结果行直接展开，不经过 jsonable_encoder 遍历
+    """
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    if isinstance(obj, Row):
+        return obj._asdict()
+    if isinstance(obj, RowMapping):
+        return dict(obj)
+    if isinstance(obj, Decimal):
+        return str(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """
+    统一的 JSON 编码，成功、失败、异常与流式响应都使用
+    已编码好的缓存数据可以用 orjson.Fragment(bytes) 包装后作为 data 传入，原样嵌入不再解析
+    """
+    return orjson.dumps(content, default=encode_default, option=OPTIONS)
+
+
+class Response(ORJSONResponse):
+    """
+    统一响应基类
+    """
+
+    def render(self, content: Any) -> bytes:
+        with phase("render"):
+            return dumps(content)
 
 
 class SuccessResponse(Response):
@@ -29,3 +81,93 @@ class ErrorResponse(Response):
         }
         self.data.update(kwargs)
         super().__init__(content=self.data, status_code=status)
+
+
+class NotModifiedResponse(Response):
+    """
+    304 响应，不带响应体
+    """
+
+    def __init__(self, headers: dict = None):
+        super().__init__(content=None, status_code=304, headers=headers)
+
+    def render(self, content: Any) -> bytes:
+        return b""
+
+
+def build_validators(version: Any, last_modified: datetime.datetime = None) -> dict[str, str]:
+    """
+    根据数据版本生成条件请求响应头
+    :param version: 可 repr 的数据版本，如 BaseDal.get_version 的结果加上分页参数
+    :param last_modified: 最后修改时间，无时区时按本地时间处理
+    """
+    digest = hashlib.sha1(repr(version).encode()).hexdigest()
+    headers = {"ETag": f'W/"{digest}"', "Cache-Control": "private, no-cache"}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(last_modified.astimezone(datetime.timezone.utc), usegmt=True)
+    return headers
+
+
+def not_modified(request: Request, validators: dict[str, str]) -> NotModifiedResponse | None:
+    """
+    客户端缓存仍然有效（If-None-Match 与 ETag 匹配）时返回 304 响应，否则返回 None
+    不使用 If-Modified-Since：最后修改时间无法反映硬删除，只有 ETag 包含完整的数据版本
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is None:
+        return None
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    # 弱比较，忽略 W/ 前缀
+    etag = validators["ETag"].removeprefix("W/")
+    if "*" in tags or any(tag.removeprefix("W/") == etag for tag in tags):
+        return NotModifiedResponse(validators)
+    return None
+
+
+class NDJSONStreamResponse(StreamingResponse):
+    """
+    NDJSON 流式响应，每行一个 JSON 对象，按块写出，内存占用与总行数无关
+    """
+    media_type = "application/x-ndjson"
+    chunk_size = 64 * 1024
+
+    def __init__(self, rows: AsyncIterable[dict], filename: str = None, **kwargs):
+        headers = kwargs.pop("headers", {})
+        if filename:
+            headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+        super().__init__(self.encode(rows), headers=headers, **kwargs)
+
+    async def encode(self, rows: AsyncIterable[dict]) -> AsyncIterator[bytes]:
+        buffer = bytearray()
+        async for row in rows:
+            buffer += dumps(row)
+            buffer += b"\n"
+            if len(buffer) >= self.chunk_size:
+                yield bytes(buffer)
+                buffer.clear()
+        if buffer:
+            yield bytes(buffer)
+
+
+class CSVStreamResponse(NDJSONStreamResponse):
+    """
+    CSV 流式响应，表头取自第一行数据的字段名，带 BOM 以便 Excel 正确识别中文
+    """
+    media_type = "text/csv"
+
+    async def encode(self, rows: AsyncIterable[dict]) -> AsyncIterator[bytes]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        header = None
+        yield codecs.BOM_UTF8
+        async for row in rows:
+            if header is None:
+                header = list(row.keys())
+                writer.writerow(header)
+            writer.writerow([row.get(key) for key in header])
+            if buffer.tell() >= self.chunk_size:
+                yield buffer.getvalue().encode()
+                buffer.seek(0)
+                buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue().encode()
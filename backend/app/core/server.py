@@ -0,0 +1,76 @@
+import importlib.util
+import logging
+import os
+
+import uvicorn
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def resolve_workers(workers: int = None) -> int:
+    """
+    工作进程数，未配置（0）时与 CPU 核数相同
+    """
+    workers = workers or settings.workers
+    return workers if workers > 0 else os.cpu_count() or 1
+
+
+def resolve_pool_size(workers: int, budget: int = None) -> tuple[int, int]:
+    """
+    按连接预算计算每个工作进程的连接池大小，保证 workers × (pool_size + max_overflow) 不超过预算，
+    缩减时保持 pool_size 与 max_overflow 的比例；未配置预算或预算充足时使用原配置
+    :return: (pool_size, max_overflow)
+    """
+    budget = budget or settings.db_connection_budget
+    pool_size, max_overflow = settings.db_pool_size, settings.db_max_overflow
+    if not budget or workers * (pool_size + max_overflow) <= budget:
+        return pool_size, max_overflow
+    per_worker = budget // workers
+    if per_worker < 1:
+        raise ValueError(f"数据库连接预算 {budget} 不足以分配给 {workers} 个工作进程")
+    size = max(1, per_worker * pool_size // (pool_size + max_overflow))
+    return size, per_worker - size
+
+
+def resolve_implementation() -> tuple[str, str]:
+    """
+    事件循环与 HTTP 解析器，已安装 uvloop / httptools 时优先使用
+    """
+    loop = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+    http = "httptools" if importlib.util.find_spec("httptools") else "h11"
+    return loop, http
+
+
+def serve(app: str = "main:app", host: str = None, port: int = None, workers: int = None) -> None:
+    """
+    生产环境启动入口，多进程时由主进程管理工作进程：
+        SIGHUP           逐个优雅重启所有工作进程（重新加载代码与配置）
+        SIGTTIN/SIGTTOU  增加/减少一个工作进程
+        SIGINT/SIGTERM   等待进行中的请求完成（最长 graceful_shutdown_timeout 秒）后退出
+    多进程时工作进程重新导入配置，连接池大小通过环境变量传递；
+    单进程时 uvicorn 在当前进程内运行，配置已经加载，同时直接修改 settings（引擎在启动时才创建）
+    """
+    workers = resolve_workers(workers)
+    pool_size, max_overflow = resolve_pool_size(workers)
+    os.environ["DB_POOL_SIZE"] = str(pool_size)
+    os.environ["DB_MAX_OVERFLOW"] = str(max_overflow)
+    settings.db_pool_size, settings.db_max_overflow = pool_size, max_overflow
+    loop, http = resolve_implementation()
+    logger.info(
+        "启动服务",
+        extra={"workers": workers, "pool_size": pool_size, "max_overflow": max_overflow, "loop": loop, "http": http}
+    )
+    uvicorn.run(
+        app,
+        host=host or settings.host,
+        port=port or settings.port,
+        workers=workers,
+        loop=loop,
+        http=http,
+        timeout_graceful_shutdown=settings.graceful_shutdown_timeout,
+        limit_max_requests=settings.worker_max_requests,
+        # 请求日志由性能分析中间件输出
+        access_log=not settings.profile_enable,
+    )
@@ -1,31 +1,79 @@
+import base64
 import datetime
+import time
+from functools import lru_cache
+
+import orjson
 from fastapi import HTTPException
 from fastapi.encoders import jsonable_encoder
-from sqlalchemy import func, delete, update, select, insert
+from pydantic import TypeAdapter
+from sqlalchemy import func, delete, update, select, insert, or_, and_, distinct, text, inspect, bindparam
+from sqlalchemy.dialects import mysql, postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql.selectable import Select as SelectType
-from typing import Any, List
+from typing import Any, AsyncGenerator, List
 
+from app.config import settings
 from app.core.enums import DeleteStatus
+from app.utils.cache import TTLCache
+from app.utils.request_profile import phase
+
+# 列表总数缓存，按查询语句与参数区分
+count_cache = TTLCache(maxsize=settings.count_cache_size, ttl=settings.count_cache_ttl)
+# 查询语句结构缓存，筛选值以绑定参数传入，相同结构的查询复用同一个 Select 对象
+statement_cache = TTLCache(maxsize=settings.statement_cache_size)
+
+
+@lru_cache(maxsize=None)
+def get_list_adapter(schema: Any) -> TypeAdapter:
+    """
+    缓存 list[schema] 的 TypeAdapter，整页数据一次完成校验与导出
+    """
+    return TypeAdapter(list[schema])
+
+
+@lru_cache(maxsize=None)
+def get_schema_columns(model: Any, schema: Any) -> tuple | None:
+    """
+    根据输出 schema 的字段推导需要查询的列，schema 中存在非表字段时返回 None
+    """
+    columns = inspect(model).columns
+    if not all(name in columns for name in schema.model_fields):
+        return None
+    return tuple(getattr(model, name) for name in schema.model_fields)
 
 
 class BaseDal:
     ORDER_FIELD = ["desc", "descending"]
+    # 包含这些参数的查询结构无法作为缓存键，每次重新构建
+    STRUCTURAL_ARGS = ("v_start_sql", "v_where", "v_select_from", "v_join", "v_outer_join", "v_options")
 
-    def __init__(self, db: AsyncSession = None, model: Any = None, schema: Any = None):
+    def __init__(self, db: AsyncSession = None, model: Any = None, schema: Any = None, read_db: AsyncSession = None):
+        """
+        :param db: 主库会话，所有写操作使用
+        :param read_db: 只读（从库）会话，传入后只有返回序列化结果、投影字典或计数的查询走从库；
+                        返回 ORM 实例的查询始终走主库，实例可直接修改后 flush，也不受复制延迟影响
+        """
         self.db = db
+        self.read_db = read_db
         self.model = model
         self.schema = schema
 
-    async def get_data(self, data_id: int = None, v_return_none=False, v_schema=None, v_expire_all=False, **kwargs):
-        if v_expire_all:
-            self.db.expire_all()
+    @property
+    def reader(self) -> AsyncSession:
+        return self.read_db or self.db
 
-        sql = await self.build_query(**kwargs)
-        if data_id:
-            sql = sql.where(self.model.id == data_id)
+    async def get_data(self, data_id: int = None, v_return_none=False, v_schema=None, v_expire_all=False,
+                       v_use_reader=True, **kwargs):
+        """
+        :param v_use_reader: 是否允许从从库读取，只在指定 v_schema 返回序列化结果时生效，返回 ORM 实例时始终读主库
+        """
+        db = self.reader if v_use_reader and v_schema else self.db
+        if v_expire_all:
+            db.expire_all()
 
-        result = await self.db.scalars(sql)
+        sql, params = await self.get_query(data_id=data_id, **kwargs)
+        result = await db.scalars(sql, params)
         data = result.unique().first() if kwargs.get("v_options") else result.first()
 
         if not data:
@@ -39,19 +87,31 @@ class BaseDal:
             return data
 
     async def get_datas(self, page=1, limit=10, v_return_count=False, v_return_scalars=False,
-                        v_return_objs=False, v_schema=None, v_use_scalars=True, **kwargs):
-        sql = await self.build_query(**kwargs)
+                        v_return_objs=False, v_schema=None, v_use_scalars=True, v_count_mode="exact",
+                        v_projection=False, **kwargs):
+        """
+        :param v_projection: 按输出 schema 只查询需要的列，结果行直接转换为字典，不构建 ORM 实例；
+                             需要返回 ORM 实例（v_return_objs / v_return_scalars）时不投影
+        """
+        projection = v_projection and not (v_return_objs or v_return_scalars)
+        columns = self.get_projection(v_schema, **kwargs) if projection else None
+        sql, params = await self.get_query(v_columns=columns, **kwargs)
 
         count = 0
         if v_return_count:
-            count_sql = select(func.count()).select_from(sql.alias())
-            count_result = await self.db.execute(count_sql)
-            count = count_result.scalar()
+            count = await self.get_count(v_count_mode=v_count_mode, **kwargs)
 
         if limit:
             sql = sql.offset((page - 1) * limit).limit(limit)
 
-        result = await self.execute_query(sql, use_scalars=v_use_scalars)
+        if columns:
+            result = await self.reader.execute(sql, params)
+            datas = [dict(row) for row in result.mappings()]
+            return (datas, count) if v_return_count else datas
+
+        # 返回 ORM 实例时读主库
+        use_reader = not (v_return_scalars or v_return_objs)
+        result = await self.execute_query(sql, use_scalars=v_use_scalars, params=params, use_reader=use_reader)
 
         if v_return_scalars:
             return (result, count) if v_return_count else result
@@ -60,9 +120,186 @@ class BaseDal:
         if v_return_objs:
             return (all_data, count) if v_return_count else all_data
 
-        serialized = [await self.serialize(obj, v_schema) for obj in all_data]
+        serialized = self.serialize_datas(all_data, v_schema)
         return (serialized, count) if v_return_count else serialized
 
+    async def stream_datas(self, v_schema=None, v_batch_size=1000, v_return_objs=False, v_projection=False,
+                           **kwargs) -> AsyncGenerator[Any, None]:
+        """
+        流式读取数据，使用服务端游标按批次拉取，内存占用与总行数无关，适用于导出
+        筛选、连接、排序参数与 get_datas 一致；yield_per 不支持集合类型的 joinedload
+        :param v_batch_size: 每批从数据库拉取的行数
+        :param v_projection: 按输出 schema 只查询需要的列
+        """
+        columns = self.get_projection(v_schema, **kwargs) if v_projection and not v_return_objs else None
+        sql = await self.build_query(v_columns=columns, **kwargs)
+        if columns:
+            result = await self.reader.stream(sql.execution_options(yield_per=v_batch_size))
+            async for partition in result.mappings().partitions():
+                for row in partition:
+                    yield dict(row)
+            return
+        db = self.db if v_return_objs else self.reader
+        result = await db.stream_scalars(sql.execution_options(yield_per=v_batch_size))
+        async for partition in result.partitions():
+            for obj in partition if v_return_objs else self.serialize_datas(partition, v_schema):
+                yield obj
+
+    async def get_count(self, v_count_mode="exact", v_start_sql: SelectType = None, v_where=None,
+                        v_select_from=None, v_join=None, v_outer_join=None, v_options=None, v_order=None,
+                        v_order_field=None, **kwargs) -> int:
+        """
+        获取列表总数
+        与 get_datas 使用相同的查询（去掉排序与加载选项、只查询主键），作为子查询计数，
+        连接导致一行主表数据对应多行结果时，总数与分页返回的行数一致
+        :param v_count_mode: exact 精确计数 / cached 按筛选条件短时缓存 /
+                             approximate 无筛选条件时读取表统计信息的估算值，有筛选条件时同 cached
+        """
+        if v_start_sql is not None:
+            # 自定义查询无法推断结构，去掉排序后作为子查询计数
+            sql = self.add_relation(v_start_sql, v_select_from, v_join, v_outer_join)
+            sql = self.add_filter_condition(sql, v_where, **kwargs)
+        else:
+            sql = await self.build_query(v_where=v_where, v_select_from=v_select_from, v_join=v_join,
+                                         v_outer_join=v_outer_join, v_columns=(self.model.id,), **kwargs)
+            filtered = v_where or v_join or v_outer_join or any(value not in (None, "") for value in kwargs.values())
+            if v_count_mode == "approximate" and not filtered:
+                count = await self.get_approximate_count()
+                if count is not None:
+                    return count
+        count_sql = select(func.count()).select_from(sql.order_by(None).subquery())
+
+        if v_count_mode in ("cached", "approximate"):
+            compiled = count_sql.compile()
+            key = (str(compiled), repr(sorted(compiled.params.items())))
+            count = count_cache.get(key)
+            if count is None:
+                count = (await self.reader.execute(count_sql)).scalar()
+                count_cache.set(key, count)
+            return count
+        return (await self.reader.execute(count_sql)).scalar()
+
+    async def get_approximate_count(self) -> int | None:
+        """
+        读取 MySQL 表统计信息中的估算行数，不扫描数据，其它数据库返回 None
+        """
+        if self.reader.bind.dialect.name != "mysql":
+            return None
+        sql = text(
+            "SELECT table_rows FROM information_schema.tables "
+            "WHERE table_schema = DATABASE() AND table_name = :table_name"
+        )
+        result = await self.reader.execute(sql, {"table_name": self.model.__tablename__})
+        return result.scalar()
+
+    async def get_version(self, v_where=None, v_select_from=None, v_join=None, v_outer_join=None, v_options=None,
+                          v_order=None, v_order_field=None, **kwargs) -> tuple[int, datetime.datetime | None, int | None]:
+        """
+        获取筛选结果的版本，用于条件请求（ETag / Last-Modified）
+        单条聚合语句，不读取数据行；新增、修改（updated_at 变化，MySQL 为微秒精度）、删除（数量变化）都会改变版本
+        筛选参数与 get_datas 一致，不支持 v_start_sql
+        :return: (数量, 最后修改时间, 最大 id)
+        """
+        joined = bool(v_join or v_outer_join)
+        model = self.model
+        sql = select(
+            func.count(distinct(model.id)) if joined else func.count(),
+            func.max(model.updated_at),
+            func.max(model.id)
+        ).select_from(model).where(model.is_delete == DeleteStatus.NO.value)
+        sql = self.add_relation(sql, v_select_from, v_join, v_outer_join)
+        sql = self.add_filter_condition(sql, v_where, **kwargs)
+        count, last_modified, max_id = (await self.reader.execute(sql)).one()
+        return count, last_modified, max_id
+
+    async def get_datas_by_cursor(self, cursor: str = None, limit=10, v_return_objs=False, v_schema=None,
+                                  v_order=None, v_order_field=None, **kwargs):
+        """
+        游标（keyset）分页，按 (排序字段, id) 定位下一页，不使用 OFFSET，
+        任意深度的翻页开销与首页一致，并发插入数据时也不会出现重复或遗漏
+        排序字段不应包含 NULL 值
+        :param cursor: 上一次返回的 next/prev 游标，为空时从第一页开始
+        :param limit: 每页数量
+        :return: (数据列表, {"next": 下一页游标, "prev": 上一页游标})
+        """
+        field_name = v_order_field or "id"
+        field = getattr(self.model, field_name)
+        desc = v_order in self.ORDER_FIELD
+        direction, value, last_id = self.decode_cursor(cursor, field) if cursor else ("next", None, None)
+        backward = direction == "prev"
+        # 向前翻页时反向排序查询，取出后再翻转回原顺序
+        sql_desc = desc != backward
+
+        sql = await self.build_query(**kwargs)
+        if last_id is not None:
+            sql = sql.where(self.keyset_condition(field, value, last_id, sql_desc))
+        id_field = self.model.id
+        if field_name == "id":
+            sql = sql.order_by(id_field.desc() if sql_desc else id_field)
+        else:
+            sql = sql.order_by(*((field.desc(), id_field.desc()) if sql_desc else (field, id_field)))
+        sql = sql.limit(limit + 1)
+
+        result = await self.execute_query(sql, use_reader=not v_return_objs)
+        rows = list(result.unique().all() if kwargs.get("v_options") else result.all())
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        if backward:
+            rows.reverse()
+
+        # 向后翻页时是否还有下一页由多取的一条判断，向前翻页时来源页必然存在，反之亦然
+        has_next = True if backward else has_more
+        has_prev = has_more if backward else cursor is not None
+        cursors = {"next": None, "prev": None}
+        if rows:
+            if has_next:
+                cursors["next"] = self.encode_cursor("next", getattr(rows[-1], field_name), rows[-1].id)
+            if has_prev:
+                cursors["prev"] = self.encode_cursor("prev", getattr(rows[0], field_name), rows[0].id)
+
+        if v_return_objs:
+            return rows, cursors
+        return self.serialize_datas(rows, v_schema), cursors
+
+    def keyset_condition(self, field, value, last_id: int, desc: bool):
+        """
+        生成 (field, id) 的行比较条件，展开为 OR/AND 形式以便 MySQL 使用索引
+        """
+        id_field = self.model.id
+        if field is id_field:
+            return id_field < last_id if desc else id_field > last_id
+        if desc:
+            return or_(field < value, and_(field == value, id_field < last_id))
+        return or_(field > value, and_(field == value, id_field > last_id))
+
+    @staticmethod
+    def encode_cursor(direction: str, value: Any, last_id: int) -> str:
+        raw = orjson.dumps([direction, value, last_id])
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor: str, field) -> tuple:
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            direction, value, last_id = orjson.loads(raw)
+        except (ValueError, TypeError):
+            raise HTTPException(status_code=400, detail="无效的分页游标")
+        if direction not in ("next", "prev") or not isinstance(last_id, int):
+            raise HTTPException(status_code=400, detail="无效的分页游标")
+        if isinstance(value, str):
+            try:
+                python_type = field.type.python_type
+            except NotImplementedError:
+                python_type = str
+            try:
+                if python_type is datetime.datetime:
+                    value = datetime.datetime.fromisoformat(value)
+                elif python_type is datetime.date:
+                    value = datetime.date.fromisoformat(value)
+            except ValueError:
+                raise HTTPException(status_code=400, detail="无效的分页游标")
+        return direction, value, last_id
+
     async def create_data(self, data, v_schema=None, v_return_obj=False):
         obj = self.model(**(data if isinstance(data, dict) else data.model_dump()))
         await self.flush(obj)
@@ -72,6 +309,102 @@ class BaseDal:
         await self.db.execute(insert(self.model), datas)
         await self.db.flush()
 
+    async def bulk_create_datas(self, datas: List[dict], v_chunk_size=1000, v_upsert_fields: List[str] = None,
+                                v_conflict_fields: List[str] = None, v_return_ids=False,
+                                v_key_field: str = None) -> dict:
+        """
+        分批批量写入，避免单个语句超过 max_allowed_packet
+        :param v_chunk_size: 每批写入的行数
+        :param v_upsert_fields: 冲突时更新的字段，MySQL 使用 ON DUPLICATE KEY UPDATE，SQLite/PostgreSQL 使用 ON CONFLICT
+        :param v_conflict_fields: SQLite/PostgreSQL 判断冲突的唯一字段，默认主键，MySQL 由表上的唯一索引决定
+        :param v_return_ids: 返回生成的主键，数据库支持 INSERT ... RETURNING 时随批量写入一起返回；
+                             MySQL 不支持 RETURNING，每批写为一条多行 INSERT，此时每批数据的字段需一致，
+                             且不支持与 v_upsert_fields 同时使用：
+                             innodb_autoinc_lock_mode 为 0/1 时，行数已知的单条 INSERT 一次分配连续的自增值，
+                             由 lastrowid（该语句第一行的自增 ID）与行数推算；
+                             为 2（MySQL 8 默认）时并发写入下自增值可能交错，按 v_key_field 回查本批写入的主键
+        :param v_key_field: 在本批数据中取值唯一的字段，MySQL 交错自增模式下用于回查主键，未指定时拒绝返回主键
+        :return: 写入统计 {"rows", "chunks", "seconds", "rows_per_second", "ids"}
+        """
+        dialect = self.db.bind.dialect
+        stmt = self.build_insert(dialect.name, v_upsert_fields, v_conflict_fields)
+        ids = []
+        chunks = 0
+        if v_return_ids and not dialect.insert_executemany_returning and v_upsert_fields:
+            raise ValueError(f"{dialect.name} 数据库冲突更新写入不支持返回主键")
+        lock_mode, increment = await self.get_auto_increment_settings() if v_return_ids else (None, 1)
+        if lock_mode == 2 and not dialect.insert_executemany_returning and not v_key_field:
+            raise ValueError("innodb_autoinc_lock_mode=2 时自增值可能不连续，返回主键需指定 v_key_field")
+        start = time.perf_counter()
+        for index in range(0, len(datas), v_chunk_size):
+            chunk = datas[index:index + v_chunk_size]
+            if v_return_ids and dialect.insert_executemany_returning:
+                result = await self.db.execute(stmt.returning(self.model.id), chunk)
+                ids.extend(result.scalars().all())
+            elif v_return_ids:
+                conn = await self.db.connection()
+                result = await conn.execute(stmt.values(chunk))
+                first_id = result.lastrowid
+                if lock_mode == 2:
+                    ids.extend(await self.get_inserted_ids(chunk, v_key_field, first_id))
+                else:
+                    ids.extend(range(first_id, first_id + len(chunk) * increment, increment))
+            else:
+                await self.db.execute(stmt, chunk)
+            chunks += 1
+        await self.db.flush()
+        seconds = time.perf_counter() - start
+        return {
+            "rows": len(datas),
+            "chunks": chunks,
+            "seconds": round(seconds, 4),
+            "rows_per_second": round(len(datas) / seconds) if seconds else 0,
+            "ids": ids if v_return_ids else None,
+        }
+
+    async def get_auto_increment_settings(self) -> tuple[int | None, int]:
+        """
+        MySQL 自增锁模式（innodb_autoinc_lock_mode）与步长（auto_increment_increment），其它数据库返回 (None, 1)
+        """
+        if self.db.bind.dialect.name != "mysql":
+            return None, 1
+        sql = text("SELECT @@innodb_autoinc_lock_mode, @@auto_increment_increment")
+        lock_mode, increment = (await self.db.execute(sql)).one()
+        return int(lock_mode), int(increment or 1)
+
+    async def get_inserted_ids(self, datas: List[dict], key_field: str, first_id: int) -> list[int]:
+        """
+        按唯一字段回查刚写入的一批数据的主键，顺序与 datas 一致
+        本批的自增值都不小于 first_id，以此排除字段值相同的已有数据
+        """
+        key = getattr(self.model, key_field)
+        values = [data[key_field] for data in datas]
+        sql = select(key, self.model.id).where(key.in_(values), self.model.id >= first_id)
+        mapping = dict((await self.db.execute(sql)).all())
+        if len(mapping) != len(datas):
+            raise ValueError(f"按 {key_field} 回查到 {len(mapping)} 个主键，本批写入 {len(datas)} 行，字段值需在本批中唯一")
+        return [mapping[value] for value in values]
+
+    def build_insert(self, dialect_name: str, v_upsert_fields: List[str] = None, v_conflict_fields: List[str] = None):
+        """
+        构建写入语句，指定 v_upsert_fields 时按数据库方言生成冲突更新语句
+        """
+        if not v_upsert_fields:
+            return insert(self.model)
+        fields = list(v_upsert_fields)
+        if hasattr(self.model, "updated_at") and "updated_at" not in fields:
+            fields.append("updated_at")
+        if dialect_name == "mysql":
+            stmt = mysql.insert(self.model)
+            return stmt.on_duplicate_key_update({field: stmt.inserted[field] for field in fields})
+        if dialect_name in ("sqlite", "postgresql"):
+            stmt = (sqlite if dialect_name == "sqlite" else postgresql).insert(self.model)
+            return stmt.on_conflict_do_update(
+                index_elements=v_conflict_fields or ["id"],
+                set_={field: stmt.excluded[field] for field in fields}
+            )
+        raise ValueError(f"{dialect_name} 数据库不支持冲突更新写入")
+
     async def put_data(self, data_id: int, data: Any, v_schema=None, v_return_obj=False):
         obj = await self.get_data(data_id)
         for key, value in jsonable_encoder(data).items():
@@ -79,6 +412,42 @@ class BaseDal:
         await self.flush(obj)
         return await self.serialize(obj, v_schema, v_return_obj)
 
+    async def update_data(self, data_id: int, data: Any, v_return_row=False) -> Any:
+        """
+        单语句更新 UPDATE ... WHERE id=:id AND is_delete=0，不预先查询也不刷新
+        :param v_return_row: 数据库支持 UPDATE ... RETURNING 时在同一次往返中返回更新后的行
+        :return: 受影响的行数，v_return_row 生效时返回更新后的行字典，未找到时为 None
+        """
+        values = data if isinstance(data, dict) else data.model_dump(exclude_unset=True)
+        sql = update(self.model).where(
+            self.model.id == data_id,
+            self.model.is_delete == DeleteStatus.NO.value
+        ).values(**values)
+        if v_return_row and self.db.bind.dialect.update_returning:
+            result = await self.db.execute(sql.returning(*self.model.__table__.columns))
+            row = result.mappings().first()
+            return dict(row) if row else None
+        result = await self.db.execute(sql)
+        return result.rowcount
+
+    async def update_datas(self, datas: List[dict]) -> int:
+        """
+        批量部分更新，每条数据包含 id 与需要修改的字段，字段相同的数据合并为一次 executemany
+        :return: 受影响的行数
+        """
+        table = self.model.__table__
+        groups: dict[tuple, list] = {}
+        for data in datas:
+            values = {key: value for key, value in data.items() if key != "id"}
+            values["_id"] = data["id"]
+            groups.setdefault(tuple(sorted(values)), []).append(values)
+        rowcount = 0
+        for params in groups.values():
+            sql = update(table).where(table.c.id == bindparam("_id"), table.c.is_delete == DeleteStatus.NO.value)
+            result = await self.db.execute(sql, params)
+            rowcount += max(result.rowcount, 0)
+        return rowcount
+
     async def delete_datas(self, ids: List[int], v_soft=False, **kwargs):
         if v_soft:
             await self.db.execute(update(self.model).where(self.model.id.in_(ids)).values(
@@ -90,9 +459,53 @@ class BaseDal:
             await self.db.execute(delete(self.model).where(self.model.id.in_(ids)))
         await self.db.flush()
 
+    def get_projection(self, v_schema=None, v_start_sql: SelectType = None, v_options=None, **kwargs) -> tuple | None:
+        """
+        获取列投影，自定义查询或带加载选项时无法投影，返回 None
+        """
+        if v_start_sql is not None or v_options:
+            return None
+        return get_schema_columns(self.model, v_schema or self.schema)
+
+    async def get_query(self, data_id: int = None, v_columns=None, v_order=None, v_order_field=None,
+                        **kwargs) -> tuple[SelectType, dict | None]:
+        """
+        获取查询语句与绑定参数
+        只包含等值筛选时，按 (模型, 查询列, 筛选字段, 排序) 缓存语句结构，筛选值作为绑定参数传入，
+        省去每次构建 Select 的开销，也保证 SQLAlchemy 编译缓存稳定命中
+        """
+        if any(kwargs.get(arg) is not None for arg in self.STRUCTURAL_ARGS):
+            sql = await self.build_query(v_columns=v_columns, v_order=v_order, v_order_field=v_order_field, **kwargs)
+            if data_id:
+                sql = sql.where(self.model.id == data_id)
+            return sql, None
+
+        fields = {field: value for field, value in kwargs.items()
+                  if field not in self.STRUCTURAL_ARGS and value not in (None, "")}
+        key = (self.model, v_columns, tuple(sorted(fields)), v_order in self.ORDER_FIELD, v_order_field, bool(data_id))
+        sql = statement_cache.get(key)
+        if sql is None:
+            sql = select(*(v_columns or (self.model,))).where(self.model.is_delete == DeleteStatus.NO.value)
+            for field in key[2]:
+                sql = sql.where(getattr(self.model, field) == bindparam(f"p_{field}"))
+            if data_id:
+                sql = sql.where(self.model.id == bindparam("p__id"))
+            sql = self.add_order(sql, v_order, v_order_field)
+            statement_cache.set(key, sql)
+        params = {f"p_{field}": value for field, value in fields.items()}
+        if data_id:
+            params["p__id"] = data_id
+        return sql, params
+
     async def build_query(self, v_start_sql: SelectType = None, v_where=None, v_order=None, v_order_field=None,
-                          v_select_from=None, v_join=None, v_outer_join=None, v_options=None, **kwargs):
-        sql = v_start_sql or select(self.model).where(self.model.is_delete == DeleteStatus.NO.value)
+                          v_select_from=None, v_join=None, v_outer_join=None, v_options=None, v_columns=None,
+                          **kwargs):
+        """
+        :param v_columns: 只查询指定的列，为空时查询完整的模型实例
+        """
+        sql = v_start_sql or select(*(v_columns or (self.model,))).where(
+            self.model.is_delete == DeleteStatus.NO.value
+        )
         sql = self.add_relation(sql, v_select_from, v_join, v_outer_join, v_options)
         sql = self.add_filter_condition(sql, v_where, **kwargs)
         sql = self.add_order(sql, v_order, v_order_field)
@@ -126,8 +539,12 @@ class BaseDal:
                 sql = sql.where(getattr(self.model, field) == value)
         return sql
 
-    async def execute_query(self, sql: SelectType, use_scalars=True):
-        return await (self.db.scalars(sql) if use_scalars else self.db.execute(sql))
+    async def execute_query(self, sql: SelectType, use_scalars=True, params: dict = None, use_reader=True):
+        """
+        :param use_reader: 是否读从库，返回 ORM 实例给调用方时应为 False
+        """
+        db = self.reader if use_reader else self.db
+        return await (db.scalars(sql, params) if use_scalars else db.execute(sql, params))
 
     async def serialize(self, obj: Any, v_schema=None, v_return_obj=False):
         if v_return_obj:
@@ -135,10 +552,22 @@ class BaseDal:
         schema = v_schema or self.schema
         return schema.model_validate(obj).model_dump()
 
-    async def flush(self, obj: Any = None):
+    def serialize_datas(self, objs: List[Any], v_schema=None) -> List[dict]:
+        """
+        批量序列化，通过缓存的 TypeAdapter 一次校验整页数据，避免逐行 await 与重复构建校验器
+        """
+        adapter = get_list_adapter(v_schema or self.schema)
+        with phase("serialize"):
+            return adapter.dump_python(adapter.validate_python(objs, from_attributes=True))
+
+    async def flush(self, obj: Any = None, v_refresh=False):
+        """
+        模型字段的默认值均在客户端计算，主键由写入结果带回，刷新后无需再查询一次
+        :param v_refresh: 存在数据库触发器等客户端无法得知的值时，重新查询对象
+        """
         if obj:
             self.db.add(obj)
         await self.db.flush()
-        if obj:
+        if obj and v_refresh:
             await self.db.refresh(obj)
         return obj
@@ -1,12 +1,93 @@
+import asyncio
+from typing import Any, List
+
+from sqlalchemy import event, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 
 from app.crud.base import BaseDal
 from app.models.user import User
 from app.schemas.user import UserOut
+from app.utils.user_cache import user_cache
+
+# 会话 info 中待提交后清除的缓存：(用户名集合, 用户 ID 集合)
+PENDING_KEY = "user_cache_pending"
+# 提交后执行的清除任务，保留引用避免被回收
+_invalidate_tasks: set[asyncio.Task] = set()
+
+
+async def invalidate_users(usernames=(), ids=()) -> None:
+    if usernames:
+        await user_cache.invalidate(*usernames)
+    if ids:
+        await user_cache.invalidate_ids(*ids)
+
+
+def after_commit(session: Session) -> None:
+    pending = session.info.pop(PENDING_KEY, None)
+    if pending:
+        task = asyncio.get_running_loop().create_task(invalidate_users(*pending))
+        _invalidate_tasks.add(task)
+        task.add_done_callback(_invalidate_tasks.discard)
+
+
+def after_rollback(session: Session) -> None:
+    # 回滚后数据未变化，修改前已清除过缓存
+    session.info.pop(PENDING_KEY, None)
 
 
 class UserDal(BaseDal):
-    def __init__(self, db: AsyncSession):
-        super().__init__(db)
+    def __init__(self, db: AsyncSession, read_db: AsyncSession = None):
+        super().__init__(db, read_db=read_db)
         self.model = User
         self.schema = UserOut
+
+    async def invalidate_cache(self, usernames=(), ids=()) -> None:
+        """
+        清除认证缓存：修改时立即清除一次，事务提交后再清除一次，
+        避免提交前并发的认证请求把修改前的数据重新写入缓存
+        """
+        await invalidate_users(usernames, ids)
+        info = self.db.info
+        if PENDING_KEY not in info:
+            info[PENDING_KEY] = (set(), set())
+            sync_session = self.db.sync_session
+            if not event.contains(sync_session, "after_commit", after_commit):
+                event.listen(sync_session, "after_commit", after_commit)
+                event.listen(sync_session, "after_rollback", after_rollback)
+        info[PENDING_KEY][0].update(usernames)
+        info[PENDING_KEY][1].update(ids)
+
+    async def put_data(self, data_id: int, data: Any, v_schema=None, v_return_obj=False):
+        # 用户状态、密码等变更后清除认证缓存
+        result = await super().put_data(data_id, data, v_schema, v_return_obj)
+        await self.invalidate_cache(ids=[data_id])
+        return result
+
+    async def update_data(self, data_id: int, data: Any, v_return_row=False):
+        result = await super().update_data(data_id, data, v_return_row)
+        await self.invalidate_cache(ids=[data_id])
+        return result
+
+    async def update_datas(self, datas: List[dict]) -> int:
+        rowcount = await super().update_datas(datas)
+        await self.invalidate_cache(ids=[data["id"] for data in datas])
+        return rowcount
+
+    async def bulk_create_datas(self, datas: List[dict], v_chunk_size=1000, v_upsert_fields: List[str] = None,
+                                v_conflict_fields: List[str] = None, v_return_ids=False,
+                                v_key_field: str = "username") -> dict:
+        result = await super().bulk_create_datas(datas, v_chunk_size, v_upsert_fields, v_conflict_fields,
+                                                 v_return_ids, v_key_field)
+        # 冲突更新会改写已有用户
+        if v_upsert_fields:
+            await self.invalidate_cache(
+                [data["username"] for data in datas if data.get("username")],
+                [data["id"] for data in datas if data.get("id")]
+            )
+        return result
+
+    async def delete_datas(self, ids: List[int], v_soft=False, **kwargs):
+        usernames = (await self.db.scalars(select(User.username).where(User.id.in_(ids)))).all()
+        await super().delete_datas(ids, v_soft, **kwargs)
+        await self.invalidate_cache(usernames, ids)
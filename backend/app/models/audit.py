@@ -0,0 +1,19 @@
+from sqlalchemy import Column, String, SMALLINT, Integer, Text, text
+
+from app.models.base import BaseModel
+
+
+class OperationRecord(BaseModel):
+    __tablename__ = "sys_operation_record"
+
+    user_id = Column(Integer, nullable=False, default=0, server_default=text('0'), comment="操作用户ID")
+    username = Column(String(255), nullable=False, default="", server_default="", comment="用户名")
+    fullname = Column(String(255), nullable=False, default="", server_default="", comment="姓名")
+    method = Column(String(16), nullable=False, default="", server_default="", comment="请求方法")
+    path = Column(String(512), nullable=False, default="", server_default="", comment="请求路径")
+    client_ip = Column(String(64), nullable=False, default="", server_default="", comment="客户端IP")
+    user_agent = Column(String(512), nullable=False, default="", server_default="", comment="客户端标识")
+    body = Column(Text, nullable=True, comment="请求体，超出上限时截断")
+    body_size = Column(Integer, nullable=False, default=0, server_default=text('0'), comment="请求体原始大小")
+    truncated = Column(SMALLINT, nullable=False, default=0, server_default=text('0'), comment="请求体是否截断：0-否, 1-是")
+    is_delete = Column(SMALLINT, nullable=False, default=0, server_default=text('0'), comment="是否删除：0-否, 1-是")
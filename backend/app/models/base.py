@@ -1,12 +1,16 @@
 from sqlalchemy import Column, Integer, DateTime
+from sqlalchemy.dialects import mysql
 from datetime import datetime
 
 from app.core.dependencies.database import Base
 
+# MySQL 的 DATETIME 默认只精确到秒，同一秒内的多次修改无法区分，条件请求的数据版本依赖微秒精度
+PreciseDateTime = DateTime().with_variant(mysql.DATETIME(fsp=6), "mysql")
+
 
 class BaseModel(Base):
     __abstract__ = True  # 抽象基类，不创建表
 
     id = Column(Integer, primary_key=True, index=True, comment="主键ID")
-    created_at = Column(DateTime, default=datetime.now, nullable=False, comment="创建时间")
-    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now, nullable=False, comment="更新时间")
+    created_at = Column(PreciseDateTime, default=datetime.now, nullable=False, comment="创建时间")
+    updated_at = Column(PreciseDateTime, default=datetime.now, onupdate=datetime.now, nullable=False, comment="更新时间")
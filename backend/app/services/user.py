@@ -1,33 +1,41 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.dependencies.database import auto_release, release_session
 from app.core.enums import UserStatus
 from app.core.global_exc import CustomException
 from app.crud.user import UserDal
-from app.models.user import User
 from app.schemas.user import UserCreateIn, LoginIn
 from app.utils.login_manage import LoginManage
+from app.utils.login_recorder import login_recorder
+from app.utils.password_hasher import password_hasher
 
 
 class UserService:
 
     @staticmethod
-    async def login(db: AsyncSession, data: LoginIn):
+    @auto_release
+    async def login(db: AsyncSession, data: LoginIn, ip: str = ""):
         user = await UserDal(db).get_data(username=data.username, v_return_none=True)
+        # 密码校验耗时较长，先归还连接
+        await release_session(db)
         if not user:
             raise CustomException(status_code=400, msg="用户不存在")
-        result = User.verify_password(data.password, user.password)
+        result = await password_hasher.verify(data.password, user.password)
         if not result:
             raise CustomException(status_code=400, msg="密码错误")
         if user.status != UserStatus.ENABLE.value:
             raise CustomException(status_code=400, msg="用户被禁用")
+        login_recorder.record(user.id, ip)
         token = LoginManage.create_token(data={"sub": str(user.id), "username": user.username})
         return {"token": token}
 
     @staticmethod
+    @auto_release
     async def create_user(db: AsyncSession, data: UserCreateIn):
         obj = await UserDal(db).get_data(username=data.username, v_return_none=True)
+        await release_session(db)
         if obj:
             raise CustomException(status_code=400, msg="用户已存在")
-        data.password = User.get_password_hash(data.password)
+        data.password = await password_hasher.hash(data.password)
         user = await UserDal(db).create_data(data)
         return await UserDal(db).serialize(user)
@@ -0,0 +1,176 @@
+import asyncio
+import logging
+
+from fastapi import Request
+
+from app.config import settings
+from app.core.dependencies.database import session_factory
+from app.crud.base import BaseDal
+from app.models.audit import OperationRecord
+
+logger = logging.getLogger(__name__)
+
+
+class AuditWriter:
+    """
+    操作记录异步写入
+    请求中只把记录放入内存队列，由后台任务按批次写入数据库，审计不增加请求的延迟；
+    队列满时丢弃记录并计数，避免写入变慢时拖垮接口
+    """
+
+    def __init__(self, queue_size: int = 10000, batch_size: int = 200, flush_interval: float = 1.0):
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+        self._closing = False
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+
+    @staticmethod
+    async def capture(request: Request, limit: int) -> dict:
+        """
+        读取请求体，最多读取 limit + 1 字节，超出部分不读取（避免为审计缓存大文件或分块上传的请求体），记录为截断
+        Content-Length 已超过上限时直接跳过读取；
+        未读完时已读取的消息会原样交还给接口，接口读取到的请求体始终完整
+        """
+        size = int(request.headers.get("content-length") or 0)
+        if size > limit:
+            return {"body": None, "body_size": size, "truncated": 1}
+        if hasattr(request, "_body"):
+            # 接口声明的请求体参数已解析并缓存
+            body = request._body
+        elif request._stream_consumed:
+            # 表单/文件上传的请求流已被解析消费
+            return {"body": None, "body_size": size, "truncated": 1}
+        else:
+            messages = []
+            read = 0
+            more_body = True
+            while more_body and read <= limit:
+                message = await request.receive()
+                messages.append(message)
+                if message["type"] != "http.request":
+                    break
+                read += len(message.get("body", b""))
+                more_body = message.get("more_body", False)
+            body = b"".join(message.get("body", b"") for message in messages if message["type"] == "http.request")
+            if read > limit or message["type"] != "http.request":
+                AuditWriter.replay(request, messages)
+            else:
+                # 完整读取时缓存请求体，之后仍可通过 request.body() 读取
+                request._body = body
+        truncated = len(body) > limit
+        return {
+            "body": body[:limit].decode(errors="replace"),
+            "body_size": max(size, len(body)),
+            "truncated": int(truncated),
+        }
+
+    @staticmethod
+    def replay(request: Request, messages: list[dict]) -> None:
+        """
+        替换请求的 receive，先原样返回审计已读取的消息，再继续读取剩余的请求流
+        """
+        receive = request._receive
+        pending = list(messages)
+
+        async def replay_receive():
+            if pending:
+                return pending.pop(0)
+            return await receive()
+
+        request._receive = replay_receive
+
+    async def record(self, request: Request, user, limit: int = None) -> None:
+        """
+        采集一条操作记录放入写入队列
+        """
+        if self._queue is None:
+            self.start()
+        data = await self.capture(request, limit if limit is not None else settings.audit_body_limit)
+        data.update(
+            user_id=user.id,
+            username=user.username,
+            fullname=user.fullname,
+            method=request.method,
+            path=request.url.path[:512],
+            client_ip=request.client.host if request.client else "",
+            user_agent=request.headers.get("user-agent", "")[:512],
+        )
+        try:
+            self._queue.put_nowait(data)
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    def start(self) -> None:
+        if self._task is None:
+            self._closing = False
+            self._queue = asyncio.Queue(maxsize=self.queue_size)
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        停止后台任务并写入队列中剩余的记录
+        """
+        if self._task is None:
+            return
+        self._closing = True
+        try:
+            # 唤醒正在等待队列的后台任务
+            self._queue.put_nowait(None)
+        except asyncio.QueueFull:
+            pass
+        await self._task
+        self._task = None
+        batch = []
+        while not self._queue.empty():
+            item = self._queue.get_nowait()
+            if item is not None:
+                batch.append(item)
+        for index in range(0, len(batch), self.batch_size):
+            await self._write(batch[index:index + self.batch_size])
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while not self._closing:
+            item = await self._queue.get()
+            batch = []
+            deadline = loop.time() + self.flush_interval
+            while item is not None:
+                batch.append(item)
+                timeout = deadline - loop.time()
+                if len(batch) >= self.batch_size or timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+            if batch:
+                await self._write(batch)
+
+    async def _write(self, batch: list[dict]) -> None:
+        try:
+            async with session_factory() as session, session.begin():
+                await BaseDal(session, OperationRecord).create_datas(batch)
+            self.written += len(batch)
+        except Exception:
+            self.failed += len(batch)
+            logger.exception("操作记录写入失败，丢弃 %s 条", len(batch))
+
+    def stats(self) -> dict:
+        return {
+            "pending": self._queue.qsize() if self._queue is not None else 0,
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+        }
+
+
+audit_writer = AuditWriter(
+    queue_size=settings.audit_queue_size,
+    batch_size=settings.audit_batch_size,
+    flush_interval=settings.audit_flush_interval
+)
@@ -0,0 +1,78 @@
+import asyncio
+import logging
+from datetime import datetime
+
+from app.config import settings
+from app.core.dependencies.database import session_factory
+from app.crud.base import BaseDal
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+
+class LoginRecorder:
+    """
+    最后登录信息延迟写入
+    登录时只在内存中记录 (时间, IP)，同一用户多次登录只保留最新一次，
+    由后台任务定期用一次批量 UPDATE 写入，登录接口保持只读
+    """
+
+    def __init__(self, flush_interval: float = 5.0):
+        self.flush_interval = flush_interval
+        self._pending: dict[int, dict] = {}
+        self._task: asyncio.Task | None = None
+        self._stopping: asyncio.Event | None = None
+        self.recorded = 0
+        self.flushed = 0
+
+    def record(self, user_id: int, ip: str) -> None:
+        self._pending[user_id] = {"last_login_time": datetime.now(), "last_login_ip": ip}
+        self.recorded += 1
+
+    def start(self) -> None:
+        if self._task is None:
+            self._stopping = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        停止后台任务并写入剩余的登录信息
+        """
+        if self._task is not None:
+            self._stopping.set()
+            await self._task
+            self._task = None
+        await self.flush()
+
+    async def _run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                await asyncio.wait_for(self._stopping.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            await self.flush()
+
+    async def flush(self) -> None:
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        datas = [{"id": user_id, **data} for user_id, data in pending.items()]
+        try:
+            async with session_factory() as session, session.begin():
+                # 登录信息不影响认证，直接用 BaseDal 批量更新，不必清除用户缓存
+                await BaseDal(session, User).update_datas(datas)
+            self.flushed += len(datas)
+        except Exception:
+            logger.exception("最后登录信息写入失败，%s 条重新排队", len(datas))
+            for data in datas:
+                self._pending.setdefault(data.pop("id"), data)
+
+    def stats(self) -> dict:
+        return {
+            "pending": len(self._pending),
+            "recorded": self.recorded,
+            "flushed": self.flushed,
+        }
+
+
+login_recorder = LoginRecorder(flush_interval=settings.login_record_flush_interval)
@@ -0,0 +1,94 @@
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+from starlette import status
+
+from app.config import settings
+from app.core.global_exc import CustomException
+from app.models.user import User
+from app.utils.metrics import LatencyRecorder
+from app.utils.request_profile import phase
+
+
+class PasswordHasher:
+    """
+    密码哈希执行器
+    bcrypt 属于 CPU 密集型计算，放到独立的线程池/进程池中执行，避免阻塞事件循环；
+    同时限制并发数与排队长度，超出上限时快速失败，而不是让登录延迟无限增长
+    """
+
+    def __init__(self, executor_type: str = "thread", max_workers: int = 4, max_pending: int = 64):
+        """
+        :param executor_type: 执行器类型，thread 线程池 / process 进程池
+        :param max_workers: 同时进行哈希计算的最大数量
+        :param max_pending: 允许排队等待的最大数量，超出后直接拒绝
+        """
+        self.executor_type = executor_type
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor: Executor | None = None
+        self._semaphore = asyncio.Semaphore(max_workers)
+        self._in_flight = 0
+        self.rejected = 0
+        self.queue_wait = LatencyRecorder()
+        self.hash_time = LatencyRecorder()
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_type == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="hasher")
+        return self._executor
+
+    async def _run(self, func, *args):
+        if self._in_flight >= self.max_workers + self.max_pending:
+            self.rejected += 1
+            raise CustomException(
+                msg="系统繁忙，请稍后再试",
+                code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+        self._in_flight += 1
+        start = time.perf_counter()
+        try:
+            with phase("hash"):
+                async with self._semaphore:
+                    acquired = time.perf_counter()
+                    self.queue_wait.record(acquired - start)
+                    loop = asyncio.get_running_loop()
+                    result = await loop.run_in_executor(self._get_executor(), func, *args)
+                    self.hash_time.record(time.perf_counter() - acquired)
+                    return result
+        finally:
+            self._in_flight -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(User.get_password_hash, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._run(User.verify_password, password, hashed_password)
+
+    def stats(self) -> dict:
+        return {
+            "executor": self.executor_type,
+            "max_workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "in_flight": self._in_flight,
+            "rejected": self.rejected,
+            "queue_wait": self.queue_wait.snapshot(),
+            "hash_time": self.hash_time.snapshot(),
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    executor_type=settings.hash_executor,
+    max_workers=settings.hash_max_workers,
+    max_pending=settings.hash_max_pending
+)
@@ -0,0 +1,123 @@
+import logging
+import time
+
+from sqlalchemy import event, Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool
+
+from app.utils.metrics import LatencyRecorder
+from app.utils.request_profile import record_pool_wait
+
+logger = logging.getLogger(__name__)
+
+
+class PoolMonitor:
+    """
+    连接池监控，记录获取连接的等待时间、占用数量、溢出使用、预检耗时与连接创建/关闭次数
+    """
+
+    def __init__(self, name: str, slow_wait_ms: float = 100):
+        """
+        :param name: 连接池名称，用于日志与指标区分主库/从库
+        :param slow_wait_ms: 获取连接等待超过该毫秒数时记录警告日志
+        """
+        self.name = name
+        self.slow_wait = slow_wait_ms / 1000
+        self.engine: Engine | None = None
+        self.checkout_wait = LatencyRecorder()
+        self.pre_ping = LatencyRecorder()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.connects = 0
+        self.closes = 0
+        self.invalidations = 0
+        self.max_checked_out = 0
+        self.max_overflow_used = 0
+
+    def pool_class(self, base: type[Pool] = AsyncAdaptedQueuePool) -> type[Pool]:
+        """
+        生成带计时的连接池类，连接池重建（dispose）时沿用同一个类，监控不会丢失
+        """
+        monitor = self
+
+        class InstrumentedPool(base):
+            def _do_get(self):
+                start = time.perf_counter()
+                try:
+                    record = super()._do_get()
+                except PoolTimeoutError:
+                    monitor.timeouts += 1
+                    logger.warning("数据库连接池 %s 获取连接超时，等待 %.1f ms", monitor.name,
+                                   (time.perf_counter() - start) * 1000)
+                    raise
+                wait = time.perf_counter() - start
+                record.info["checkout_wait"] = wait
+                monitor.record_wait(wait)
+                return record
+
+            def connect(self):
+                start = time.perf_counter()
+                connection = super().connect()
+                # 获取连接的总耗时扣除排队等待，剩余部分主要是 pre_ping
+                cost = time.perf_counter() - start - connection.info.pop("checkout_wait", 0.0)
+                monitor.pre_ping.record(max(cost, 0.0))
+                return connection
+
+        return InstrumentedPool
+
+    @property
+    def pool(self) -> Pool | None:
+        # engine.dispose() 会重建连接池，每次从引擎上取当前的连接池
+        return self.engine.pool if self.engine is not None else None
+
+    def attach(self, engine: AsyncEngine) -> None:
+        self.engine = engine.sync_engine
+        pool = self.engine.pool
+        event.listen(pool, "connect", self.on_connect)
+        event.listen(pool, "close", self.on_close)
+        event.listen(pool, "invalidate", self.on_invalidate)
+        event.listen(pool, "checkout", self.on_checkout)
+
+    def record_wait(self, wait: float) -> None:
+        self.checkout_wait.record(wait)
+        record_pool_wait(wait)
+        if wait >= self.slow_wait:
+            logger.warning("数据库连接池 %s 获取连接等待 %.1f ms，%s", self.name, wait * 1000, self.pool_status())
+
+    def on_connect(self, dbapi_connection, connection_record):
+        self.connects += 1
+
+    def on_close(self, dbapi_connection, connection_record):
+        self.closes += 1
+
+    def on_invalidate(self, dbapi_connection, connection_record, exception):
+        self.invalidations += 1
+
+    def on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        self.checkouts += 1
+        pool = self.pool
+        if pool is not None:
+            self.max_checked_out = max(self.max_checked_out, pool.checkedout())
+            self.max_overflow_used = max(self.max_overflow_used, pool.overflow())
+
+    def pool_status(self) -> str:
+        pool = self.pool
+        return pool.status() if pool is not None else ""
+
+    def stats(self) -> dict:
+        pool = self.pool
+        return {
+            "size": pool.size() if pool is not None else 0,
+            "checked_out": pool.checkedout() if pool is not None else 0,
+            "overflow": pool.overflow() if pool is not None else 0,
+            "max_checked_out": self.max_checked_out,
+            "max_overflow_used": self.max_overflow_used,
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "connects": self.connects,
+            "closes": self.closes,
+            "invalidations": self.invalidations,
+            "checkout_wait": self.checkout_wait.snapshot(),
+            "pre_ping": self.pre_ping.snapshot(),
+        }
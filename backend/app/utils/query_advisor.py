@@ -0,0 +1,131 @@
+import logging
+import os
+import sys
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+# DAL 所在目录，用于从调用栈中找到发出查询的 DAL 方法
+CRUD_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "crud") + os.sep
+
+
+def find_dal_caller() -> str | None:
+    """
+    从调用栈中找到最外层的 DAL 方法（即服务层直接调用的方法），如 UserDal.get_data
+    SQL 在 greenlet 中同步执行，当前 greenlet 的栈到 greenlet 入口为止，之后沿父 greenlet 挂起时的栈继续查找
+    """
+    caller = None
+    frame = sys._getframe(1)
+    try:
+        from greenlet import getcurrent
+        current = getcurrent()
+    except ImportError:
+        current = None
+    while frame is not None:
+        if frame.f_code.co_filename.startswith(CRUD_DIR):
+            owner = frame.f_locals.get("self")
+            name = frame.f_code.co_name
+            caller = f"{type(owner).__name__}.{name}" if owner is not None else name
+        frame = frame.f_back
+        if frame is None and current is not None:
+            current = current.parent
+            frame = current.gr_frame if current is not None else None
+    return caller
+
+
+class QueryAdvisor:
+    """
+    查询计划检查（调试 / CI 使用）：收集每种 SELECT 语句及发出它的 DAL 方法，
+    之后逐条执行 EXPLAIN，报告全表扫描、文件排序（filesort）与临时表
+    支持 MySQL（EXPLAIN）与 SQLite（EXPLAIN QUERY PLAN）
+    """
+
+    def __init__(self, max_shapes: int = 500):
+        """
+        :param max_shapes: 最多收集的语句种类，超出后不再收集
+        """
+        self.max_shapes = max_shapes
+        # 语句 -> (首次执行的参数, 发出该语句的 DAL 方法)
+        self.shapes: dict[str, tuple] = {}
+
+    def attach(self, engine: AsyncEngine) -> None:
+        event.listen(engine.sync_engine, "before_cursor_execute", self.before_cursor_execute)
+
+    def before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if executemany or statement in self.shapes or len(self.shapes) >= self.max_shapes:
+            return
+        # 只检查业务查询，information_schema 等元数据查询不在此列
+        if statement.lstrip()[:6].upper() != "SELECT" or "information_schema" in statement:
+            return
+        self.shapes[statement] = (parameters, find_dal_caller())
+
+    async def analyze(self, engine: AsyncEngine) -> list[dict]:
+        """
+        对收集到的语句执行 EXPLAIN
+        :return: 存在问题的语句，每项包含语句、DAL 方法与问题列表
+        """
+        dialect = engine.dialect.name
+        if dialect == "mysql":
+            prefix, check = "EXPLAIN ", self.check_mysql
+        elif dialect == "sqlite":
+            prefix, check = "EXPLAIN QUERY PLAN ", self.check_sqlite
+        else:
+            logger.warning("查询计划检查不支持数据库 %s", dialect)
+            return []
+        findings = []
+        async with engine.connect() as conn:
+            for statement, (parameters, caller) in list(self.shapes.items()):
+                try:
+                    result = await conn.exec_driver_sql(prefix + statement, parameters)
+                    problems = check(result.mappings().all())
+                except Exception as e:
+                    problems = [f"EXPLAIN 执行失败：{e}"]
+                if problems:
+                    findings.append({"statement": statement, "caller": caller, "problems": problems})
+        return findings
+
+    @staticmethod
+    def check_mysql(rows: list) -> list[str]:
+        problems = []
+        for row in rows:
+            table = row.get("table")
+            if row.get("type") == "ALL":
+                problems.append(f"全表扫描 {table}（预计 {row.get('rows')} 行，可用索引 {row.get('possible_keys')}）")
+            extra = row.get("Extra") or ""
+            if "Using filesort" in extra:
+                problems.append(f"文件排序 {table}")
+            if "Using temporary" in extra:
+                problems.append(f"临时表 {table}")
+        return problems
+
+    @staticmethod
+    def check_sqlite(rows: list) -> list[str]:
+        problems = []
+        for row in rows:
+            detail = row.get("detail") or ""
+            # SCAN t USING (COVERING) INDEX 为按索引顺序遍历，不视为全表扫描
+            if detail.startswith("SCAN ") and " USING " not in detail:
+                problems.append(f"全表扫描 {detail[5:]}")
+            elif detail.startswith("USE TEMP B-TREE FOR ORDER BY"):
+                problems.append("文件排序")
+            elif detail.startswith("USE TEMP B-TREE"):
+                problems.append(f"临时表（{detail[16:]}）")
+        return problems
+
+    async def report(self, engine: AsyncEngine) -> list[dict]:
+        """
+        执行检查并将问题记录为警告日志
+        """
+        findings = await self.analyze(engine)
+        for finding in findings:
+            logger.warning("查询计划存在问题", extra=finding)
+        logger.info("查询计划检查完成", extra={"statements": len(self.shapes), "findings": len(findings)})
+        return findings
+
+    def stats(self) -> dict:
+        return {"statements": len(self.shapes)}
+
+
+query_advisor = QueryAdvisor()
@@ -0,0 +1,104 @@
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+class RequestProfile:
+    """
+    单个请求的性能数据：各阶段耗时、SQL 数量与耗时、获取连接等待时间，以及每种 SQL 的执行次数
+    """
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.phases: dict[str, float] = {}
+        self.sql_count = 0
+        self.sql_time = 0.0
+        self.pool_wait = 0.0
+        self.sql_shapes: Counter = Counter()
+
+    def add_phase(self, name: str, seconds: float) -> None:
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.start
+
+    def repeated_sql(self, threshold: int) -> dict[str, int]:
+        """
+        执行次数超过阈值的 SQL，通常意味着 N+1 查询
+        """
+        return {statement: count for statement, count in self.sql_shapes.items() if count > threshold}
+
+    def server_timing(self) -> str:
+        items = [f'db;dur={self.sql_time * 1000:.2f};desc="{self.sql_count} queries"',
+                 f"pool;dur={self.pool_wait * 1000:.2f}"]
+        items.extend(f"{name};dur={seconds * 1000:.2f}" for name, seconds in self.phases.items())
+        items.append(f"total;dur={self.elapsed * 1000:.2f}")
+        return ", ".join(items)
+
+    def to_dict(self) -> dict:
+        return {
+            "duration_ms": round(self.elapsed * 1000, 2),
+            "sql_count": self.sql_count,
+            "sql_ms": round(self.sql_time * 1000, 2),
+            "pool_wait_ms": round(self.pool_wait * 1000, 2),
+            "phases_ms": {name: round(seconds * 1000, 2) for name, seconds in self.phases.items()},
+        }
+
+
+current_profile: ContextVar[RequestProfile | None] = ContextVar("current_profile", default=None)
+
+
+@contextmanager
+def phase(name: str):
+    """
+    记录当前请求某个阶段的耗时，不在请求上下文中时不做任何事
+    """
+    profile = current_profile.get()
+    if profile is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.add_phase(name, time.perf_counter() - start)
+
+
+def record_pool_wait(seconds: float) -> None:
+    profile = current_profile.get()
+    if profile is not None:
+        profile.pool_wait += seconds
+
+
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("profile_query_start", []).append(time.perf_counter())
+
+
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = conn.info["profile_query_start"].pop()
+    profile = current_profile.get()
+    if profile is not None:
+        profile.sql_count += 1
+        profile.sql_time += time.perf_counter() - start
+        profile.sql_shapes[statement] += 1
+
+
+def handle_error(exception_context):
+    # 执行失败时不会触发 after_cursor_execute，丢弃对应的开始时间
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("profile_query_start"):
+        conn.info["profile_query_start"].pop()
+
+
+def register_engine_events(engine: AsyncEngine) -> None:
+    """
+    在引擎上统计每条 SQL 的耗时，计入当前请求
+    """
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", after_cursor_execute)
+    event.listen(engine.sync_engine, "handle_error", handle_error)
@@ -0,0 +1,67 @@
+import hashlib
+import time
+from typing import Callable
+
+from app.config import settings
+from app.utils.cache import TTLCache
+
+
+class TokenCache:
+    """
+    已验证 JWT 的缓存
+    同一个 token 在有效期内会被反复校验，解码结果只取决于 token 本身，
+    因此按 token 摘要缓存解码后的 claims，条目在 token 自身的 exp 时间点过期
+    """
+
+    def __init__(self, maxsize: int = 10000):
+        self._claims = TTLCache(maxsize)
+        self._revoked = TTLCache(maxsize)
+        self._revocation_hooks: list[Callable[[dict], bool]] = []
+
+    @staticmethod
+    def digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def add_revocation_hook(self, hook: Callable[[dict], bool]) -> None:
+        """
+        注册吊销检查函数，接收 claims，返回 True 表示该 token 已被吊销
+        """
+        self._revocation_hooks.append(hook)
+
+    def is_revoked(self, token: str, claims: dict | None = None) -> bool:
+        if self.digest(token) in self._revoked:
+            return True
+        if claims is not None:
+            return any(hook(claims) for hook in self._revocation_hooks)
+        return False
+
+    def revoke(self, token: str, expire_at: float | None = None) -> None:
+        """
+        吊销 token，吊销记录保留到 token 过期为止
+        """
+        key = self.digest(token)
+        claims = self._claims.get(key)
+        if expire_at is None and claims:
+            expire_at = claims.get("exp")
+        self._claims.delete(key)
+        self._revoked.set(key, True, expire_at or time.time() + settings.jwt_token_expire_minutes * 60)
+
+    def get(self, token: str) -> dict | None:
+        return self._claims.get(self.digest(token))
+
+    def set(self, token: str, claims: dict) -> None:
+        expire_at = claims.get("exp")
+        if expire_at is None:
+            return
+        self._claims.set(self.digest(token), claims, float(expire_at))
+
+    def clear(self) -> None:
+        self._claims.clear()
+
+    def stats(self) -> dict:
+        result = self._claims.stats()
+        result["revoked"] = len(self._revoked)
+        return result
+
+
+token_cache = TokenCache(maxsize=settings.jwt_cache_size)
@@ -0,0 +1,147 @@
+import time
+
+import orjson
+
+from app.config import settings
+from app.models.user import User
+from app.utils.cache import TTLCache
+
+
+class LocalRedis:
+    """
+    本地 Redis 替身，实现 redis.asyncio.Redis 中用到的接口，值统一按 bytes 存储
+    便于在没有 Redis 服务的开发/测试环境中验证共享缓存的行为
+    """
+
+    def __init__(self):
+        self._data: dict[str, tuple[bytes, float | None]] = {}
+
+    async def get(self, name: str) -> bytes | None:
+        item = self._data.get(name)
+        if item is None:
+            return None
+        value, expire_at = item
+        if expire_at is not None and expire_at <= time.time():
+            self._data.pop(name, None)
+            return None
+        return value
+
+    async def set(self, name: str, value: bytes | str, ex: int | None = None) -> bool:
+        if isinstance(value, str):
+            value = value.encode()
+        # 与 Redis 一致，未指定 ex 时永不过期；ex 必须为正数
+        if ex is not None and ex <= 0:
+            raise ValueError("invalid expire time in 'set' command")
+        self._data[name] = (value, time.time() + ex if ex else None)
+        return True
+
+    async def delete(self, *names: str) -> int:
+        return sum(self._data.pop(name, None) is not None for name in names)
+
+
+class MemoryBackend:
+    """
+    进程内缓存后端，多 worker 部署时各进程独立，失效只作用于当前进程，依赖 ttl 兜底
+    """
+
+    def __init__(self, maxsize: int = 10000):
+        self._cache = TTLCache(maxsize)
+
+    async def get(self, key: str) -> bytes | None:
+        return self._cache.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: int) -> None:
+        self._cache.set(key, value, time.time() + ttl)
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._cache.delete(key)
+
+
+class RedisBackend:
+    """
+    共享缓存后端，client 为 redis.asyncio.Redis 或接口兼容的对象（如 LocalRedis）
+    """
+
+    def __init__(self, client):
+        self.client = client
+
+    async def get(self, key: str) -> bytes | None:
+        return await self.client.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: int) -> None:
+        await self.client.set(key, value, ex=ttl)
+
+    async def delete(self, *keys: str) -> None:
+        if keys:
+            await self.client.delete(*keys)
+
+
+class UserCache:
+    """
+    认证用户缓存
+    只缓存认证需要的字段，命中时返回一个未绑定会话的 User 实例，省去每次请求查询 sys_user
+    用户被禁用、删除或修改密码时需调用 invalidate 清除缓存
+    ttl <= 0 表示不缓存
+    """
+    FIELDS = ("id", "username", "fullname", "status", "user_type")
+    KEY_PREFIX = "auth:user:"
+    ID_KEY_PREFIX = "auth:user_id:"
+
+    def __init__(self, backend, ttl: int = 60):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, username: str) -> User | None:
+        raw = await self.backend.get(self.KEY_PREFIX + username)
+        if raw is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return User(**orjson.loads(raw))
+
+    async def set(self, user: User) -> User:
+        fields = {field: getattr(user, field) for field in self.FIELDS}
+        if self.ttl <= 0:
+            return User(**fields)
+        await self.backend.set(self.KEY_PREFIX + user.username, orjson.dumps(fields), self.ttl)
+        await self.backend.set(self.ID_KEY_PREFIX + str(user.id), user.username.encode(), self.ttl)
+        return User(**fields)
+
+    async def invalidate(self, *usernames: str) -> None:
+        await self.backend.delete(*[self.KEY_PREFIX + username for username in usernames])
+
+    async def invalidate_ids(self, *ids: int) -> None:
+        keys = []
+        for data_id in ids:
+            id_key = self.ID_KEY_PREFIX + str(data_id)
+            username = await self.backend.get(id_key)
+            keys.append(id_key)
+            if username is not None:
+                keys.append(self.KEY_PREFIX + username.decode())
+        await self.backend.delete(*keys)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+def create_backend():
+    if settings.user_cache_backend == "redis":
+        # 可选依赖，仅在使用 redis 后端时需要安装
+        from redis.asyncio import Redis
+        return RedisBackend(Redis.from_url(settings.redis_url))
+    if settings.user_cache_backend == "local_redis":
+        return RedisBackend(LocalRedis())
+    return MemoryBackend()
+
+
+user_cache = UserCache(create_backend(), ttl=settings.user_cache_ttl)
@@ -0,0 +1,49 @@
+"""
+基准测试公共部分
+
+导入任一基准测试模块（python -m benchmarks.xxx）时先执行本模块，在 app.config 加载前设置默认环境变量：
+数据库默认使用本地 SQLite 文件，也可通过 DATABASE_URL 指向一次性的测试库。
+app 相关模块在函数内导入，各脚本可以在导入 app 前追加自己的环境变量。
+"""
+import os
+import re
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///./benchmark.db")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+
+# 库名中以 _ 或 - 分隔的 test / bench / benchmark，如 bench_db、app_test；testplatform 这类项目库名不算
+THROWAWAY_NAME = re.compile(r"(^|[_-])(test|bench|benchmark)([_-]|$)")
+
+
+def check_throwaway(database_url: str) -> None:
+    """
+    拒绝可能是开发或生产环境的数据库，删除重建数据表（drop_all）前必须调用
+    """
+    scheme, _, rest = database_url.partition("://")
+    if scheme.startswith("sqlite"):
+        return
+    name = rest.rsplit("/", 1)[-1].split("?", 1)[0].lower()
+    if not THROWAWAY_NAME.search(name):
+        raise SystemExit(f"数据库 {name or database_url} 不是一次性的测试库（库名需带有 test 或 bench 分段，如 bench_db），已拒绝执行")
+
+
+async def reset_schema(drop: bool = True) -> None:
+    """
+    创建数据表，drop 为 True 时先删除全部数据表（仅限一次性的测试库）
+    """
+    from app.config import settings
+    from app.core.dependencies.database import Base, init_engine
+
+    if drop:
+        check_throwaway(settings.database_url)
+    async with init_engine().begin() as conn:
+        if drop:
+            await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+
+def build_rows(count: int, prefix: str = "user", password: str = "x") -> list[dict]:
+    """
+    生成 count 个 sys_user 行，用户名为 prefix 加 7 位序号
+    """
+    return [{"username": f"{prefix}{i:07d}", "fullname": f"用户{i:07d}", "password": password} for i in range(count)]
@@ -0,0 +1,69 @@
+"""
+审计请求体采集检查
+
+审计上限很小（16 字节）时，分块上传（无 Content-Length）与普通请求的请求体都应完整到达接口，
+审计记录只保留上限内的部分并标记截断。任一检查失败时以非零状态码退出。
+
+用法（在 backend 目录下执行，先安装 benchmarks/requirements.txt）:
+    python -m benchmarks.audit_capture
+"""
+import asyncio
+import sys
+
+import httpx
+from fastapi import Depends, FastAPI, Request
+
+from app.utils.audit_writer import AuditWriter
+
+LIMIT = 16
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+
+    async def audit(request: Request) -> dict:
+        return await AuditWriter.capture(request, LIMIT)
+
+    @app.post("/upload")
+    async def upload(request: Request, record: dict = Depends(audit)):
+        body = await request.body()
+        return {"len": len(body), "body": body.decode(), "record": record}
+
+    return app
+
+
+async def chunked(payload: bytes, size: int = 10):
+    for index in range(0, len(payload), size):
+        yield payload[index:index + size]
+
+
+async def main() -> int:
+    payload = ("0123456789" * 10).encode()
+    cases = {
+        "chunked_over_limit": {"content": chunked(payload)},
+        "chunked_under_limit": {"content": chunked(payload[:LIMIT])},
+        "content_length_over_limit": {"content": payload},
+        "content_length_under_limit": {"content": payload[:LIMIT]},
+    }
+    failures = []
+    transport = httpx.ASGITransport(app=build_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        for name, kwargs in cases.items():
+            expected = payload if "over" in name else payload[:LIMIT]
+            result = (await client.post("/upload", **kwargs)).json()
+            record = result["record"]
+            if result["body"] != expected.decode():
+                failures.append(f"{name}: 接口收到 {result['len']} 字节，应为 {len(expected)}")
+            if record["truncated"] != int("over" in name):
+                failures.append(f"{name}: truncated={record['truncated']}")
+            if record["body"] is not None and len(record["body"]) > LIMIT:
+                failures.append(f"{name}: 审计记录 {len(record['body'])} 字节，超过上限 {LIMIT}")
+            print(name, result["len"], record["truncated"], record["body_size"])
+    if failures:
+        print("\n".join(failures), file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
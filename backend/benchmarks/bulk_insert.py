@@ -0,0 +1,59 @@
+"""
+批量写入吞吐基准测试，对比逐行 create_data、create_datas 与分批 bulk_create_datas
+
+默认使用本地 SQLite（需要安装 aiosqlite），也可通过 DATABASE_URL 指向测试用 MySQL
+（数据表会被删除重建，库名需带有 test 或 bench 分段，如 bench_db）
+
+用法（在 backend 目录下执行）:
+    python -m benchmarks.bulk_insert --rows 20000 --chunk-size 1000
+"""
+import argparse
+import asyncio
+import time
+
+from app.core.dependencies.database import init_engine, session_factory
+from app.crud.user import UserDal
+from benchmarks import build_rows, reset_schema
+
+
+async def per_row(rows: list[dict], chunk_size: int):
+    async with session_factory() as session, session.begin():
+        dal = UserDal(session)
+        for row in rows:
+            await dal.create_data(row, v_return_obj=True)
+
+
+async def single_executemany(rows: list[dict], chunk_size: int):
+    async with session_factory() as session, session.begin():
+        await UserDal(session).create_datas(rows)
+
+
+async def chunked(rows: list[dict], chunk_size: int):
+    async with session_factory() as session, session.begin():
+        return await UserDal(session).bulk_create_datas(rows, v_chunk_size=chunk_size)
+
+
+async def chunked_with_ids(rows: list[dict], chunk_size: int):
+    async with session_factory() as session, session.begin():
+        return await UserDal(session).bulk_create_datas(rows, v_chunk_size=chunk_size, v_return_ids=True)
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    for func in (per_row, single_executemany, chunked, chunked_with_ids):
+        await reset_schema()
+        rows = build_rows(args.rows, func.__name__)
+        start = time.perf_counter()
+        await func(rows, args.chunk_size)
+        seconds = time.perf_counter() - start
+        print({"mode": func.__name__, "rows": args.rows, "seconds": round(seconds, 3),
+               "rows_per_second": round(args.rows / seconds)})
+    await init_engine().dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,40 @@
+"""
+统计一次 create_data 实际执行的 SQL 语句数量，验证写入后不再回查
+
+默认使用本地 SQLite（需要安装 aiosqlite），也可通过 DATABASE_URL 指向测试用 MySQL
+（数据表会被删除重建，库名需带有 test 或 bench 分段，如 bench_db）
+
+用法（在 backend 目录下执行）:
+    python -m benchmarks.create_queries
+"""
+import asyncio
+
+from sqlalchemy import event
+
+from app.core.dependencies.database import init_engine, session_factory
+from app.crud.user import UserDal
+from benchmarks import reset_schema
+
+
+async def main():
+    await reset_schema()
+
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(init_engine().sync_engine, "before_cursor_execute", before_cursor_execute)
+    async with session_factory() as session, session.begin():
+        data = await UserDal(session).create_data({"username": "benchmark", "fullname": "benchmark", "password": "x"})
+    event.remove(init_engine().sync_engine, "before_cursor_execute", before_cursor_execute)
+
+    print({"data": data, "statements": len(statements)})
+    for statement in statements:
+        print(statement)
+    assert len(statements) == 1, "create_data 应只执行一条 INSERT"
+    await init_engine().dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,63 @@
+"""
+响应封装微基准测试
+
+success: 对比 jsonable_encoder + 标准库 JSONResponse 与 SuccessResponse 直接编码 pydantic 模型列表，
+         以及使用 orjson.Fragment 嵌入预编码的缓存数据
+error:   对比改造前异常处理器的 jsonable_encoder + JSONResponse 与 ErrorResponse
+
+用法（在 backend 目录下执行）:
+    python -m benchmarks.envelope --rows 100 --count 5000
+"""
+import argparse
+import datetime
+import time
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from app.core.response import SuccessResponse, ErrorResponse, dumps
+
+
+class Item(BaseModel):
+    id: int
+    username: str
+    fullname: str
+    created_at: datetime.datetime
+
+
+def timeit(func, count: int) -> float:
+    start = time.perf_counter()
+    for _ in range(count):
+        func()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--count", type=int, default=5000)
+    args = parser.parse_args()
+
+    now = datetime.datetime.now()
+    items = [Item(id=i, username=f"user{i}", fullname=f"用户{i}", created_at=now) for i in range(args.rows)]
+    fragment = orjson.Fragment(dumps(items))
+    cases = {
+        "success_jsonable_encoder": lambda: JSONResponse(
+            content=jsonable_encoder({"code": 200, "message": "success", "data": items})
+        ),
+        "success_envelope": lambda: SuccessResponse(data=items),
+        "success_envelope_fragment": lambda: SuccessResponse(data=fragment),
+        "error_jsonable_encoder": lambda: JSONResponse(
+            status_code=200, content=jsonable_encoder({"message": "密码错误", "code": 400})
+        ),
+        "error_envelope": lambda: ErrorResponse(msg="密码错误", code=400, status=200),
+    }
+    for name, func in cases.items():
+        seconds = timeit(func, args.count)
+        print({"case": name, "count": args.count, "us_per_response": round(seconds / args.count * 1e6, 2)})
+
+
+if __name__ == "__main__":
+    main()
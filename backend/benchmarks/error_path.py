@@ -0,0 +1,75 @@
+"""
+异常处理路径吞吐基准测试
+
+对比改造前的处理方式（debug 下多次 print + 每个异常都 logger.exception 输出堆栈，同步写 stdout）
+与当前注册的异常处理器（4xx 不输出堆栈、结构化日志经队列由后台线程输出、相同日志限流）。
+输出重定向到 /dev/null，仅统计处理器本身的耗时。
+
+用法（在 backend 目录下执行）:
+    python -m benchmarks.error_path --count 20000 > /dev/null
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import sys
+import time
+
+from fastapi import Request
+from fastapi.responses import JSONResponse
+
+from app.app import create_app
+from app.core.global_exc import CustomException
+from app.core.logger import shutdown_logging
+
+
+def build_request() -> Request:
+    return Request({"type": "http", "method": "POST", "path": "/api/user/login", "headers": [],
+                    "query_string": b"", "server": ("testserver", 80), "scheme": "http"})
+
+
+async def legacy_handler(request: Request, exc: CustomException):
+    logger = logging.getLogger("legacy")
+    print("请求地址", request.url.__str__())
+    print("捕捉到重写CustomException异常异常：custom_exception_handler")
+    print(exc.desc)
+    print(exc.msg)
+    try:
+        raise exc
+    except CustomException:
+        logger.exception(exc)
+    return JSONResponse(status_code=exc.status_code, content={"message": exc.msg, "code": exc.code})
+
+
+async def run(handler, count: int) -> float:
+    request = build_request()
+    start = time.perf_counter()
+    for _ in range(count):
+        await handler(request, CustomException(status_code=400, msg="密码错误"))
+    return time.perf_counter() - start
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=20000)
+    args = parser.parse_args()
+
+    # 改造前：同步输出到 stdout 的默认日志
+    legacy_logger = logging.getLogger("legacy")
+    legacy_logger.addHandler(logging.StreamHandler(sys.stdout))
+    legacy_logger.propagate = False
+    legacy = await run(legacy_handler, args.count)
+
+    app = create_app()
+    current = await run(app.exception_handlers[CustomException], args.count)
+    shutdown_logging()
+
+    with contextlib.redirect_stdout(sys.stderr):
+        for name, seconds in (("legacy", legacy), ("current", current)):
+            print(json.dumps({"mode": name, "errors": args.count, "seconds": round(seconds, 3),
+                              "errors_per_second": round(args.count / seconds)}))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,207 @@
+"""
+接口端到端压测
+
+默认在进程内启动 create_app()（经 httpx 的 ASGITransport 调用，包含完整的生命周期），
+数据库默认使用本地 SQLite 文件（aiosqlite），也可通过 DATABASE_URL 指向一次性的本地 MySQL
+（数据表会被删除重建，库名需带有 test 或 bench 分段，如 bench_db）；
+指定 --url 时改为压测已启动的服务（此时需自行准备数据，--seed 的用户也会写入 DATABASE_URL 指向的库）。
+
+每个场景以固定并发持续请求，输出 RPS、p50/p95/p99 延迟与每个请求的 SQL 数量（取自 Server-Timing 响应头），
+结果为 JSON，可保存后作为基线，下次运行时超出允许的退化比例则以非零状态码退出。
+
+用法（在 backend 目录下执行，先安装 benchmarks/requirements.txt）:
+    python -m benchmarks.loadtest --users 1000 --concurrency 20 --duration 10 --output result.json
+    python -m benchmarks.loadtest --baseline result.json --max-regression 0.1
+"""
+import argparse
+import asyncio
+import json
+import random
+import re
+import sys
+import time
+import uuid
+
+import httpx
+
+from app.app import create_app
+from app.config import settings
+from app.core.dependencies.database import init_engine, session_factory
+from app.crud.user import UserDal
+from app.models.user import User
+from benchmarks import build_rows, reset_schema
+
+PASSWORD = "benchmark"
+QUERY_COUNT = re.compile(r'db;dur=[\d.]+;desc="(\d+) queries"')
+
+
+async def seed(count: int) -> list[str]:
+    """
+    重建表并写入 count 个用户，所有用户共用同一个密码哈希
+    """
+    await reset_schema()
+    rows = build_rows(count, "bench", User.get_password_hash(PASSWORD))
+    async with session_factory() as session, session.begin():
+        await UserDal(session).bulk_create_datas(rows, v_chunk_size=1000)
+    return [row["username"] for row in rows]
+
+
+def percentile(samples: list[float], p: float) -> float:
+    if not samples:
+        return 0.0
+    return samples[min(len(samples) - 1, int(round(p / 100 * (len(samples) - 1))))]
+
+
+class Scenario:
+    def __init__(self, name: str, usernames: list[str], tokens: list[str]):
+        self.name = name
+        self.usernames = usernames
+        self.tokens = tokens
+        # list 场景携带上一次响应的 ETag，模拟前端轮询列表页
+        self.etag = None
+
+    def build(self) -> tuple[str, str, dict]:
+        """
+        :return: (method, path, 请求参数)
+        """
+        prefix = settings.prefix
+        if self.name == "login":
+            return "POST", f"{prefix}/user/login", {
+                "json": {"username": random.choice(self.usernames), "password": PASSWORD}
+            }
+        if self.name == "register":
+            name = f"r{uuid.uuid4().hex[:16]}"
+            return "POST", f"{prefix}/user/register", {
+                "json": {"username": name, "fullname": name, "password": PASSWORD}
+            }
+        if self.name == "info":
+            return "GET", f"{prefix}/user/info", {"headers": {"token": random.choice(self.tokens)}}
+        if self.name == "list":
+            headers = {"token": random.choice(self.tokens)}
+            if self.etag:
+                headers["If-None-Match"] = self.etag
+            return "GET", f"{prefix}/user/list", {"headers": headers}
+        raise ValueError(f"未知场景 {self.name}")
+
+
+async def run_scenario(client: httpx.AsyncClient, scenario: Scenario, concurrency: int, duration: float) -> dict:
+    latencies = []
+    queries = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async def worker():
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            method, path, kwargs = scenario.build()
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, path, **kwargs)
+                ok = response.status_code == 304 or (
+                    response.status_code == 200 and response.json().get("code") == 200
+                )
+                if response.headers.get("etag"):
+                    scenario.etag = response.headers["etag"]
+            except httpx.HTTPError:
+                response, ok = None, False
+            latencies.append(time.perf_counter() - start)
+            if not ok:
+                errors += 1
+            if response is not None:
+                match = QUERY_COUNT.search(response.headers.get("server-timing", ""))
+                if match:
+                    queries.append(int(match.group(1)))
+
+    start = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "concurrency": concurrency,
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "queries_per_request": round(sum(queries) / len(queries), 2) if queries else None,
+    }
+
+
+async def login_tokens(client: httpx.AsyncClient, usernames: list[str], count: int) -> list[str]:
+    tokens = []
+    for username in random.sample(usernames, min(count, len(usernames))):
+        response = await client.post(f"{settings.prefix}/user/login",
+                                      json={"username": username, "password": PASSWORD})
+        tokens.append(response.json()["data"]["token"])
+    return tokens
+
+
+def compare(result: dict, baseline: dict, max_regression: float) -> list[str]:
+    """
+    与基线比较，RPS 下降或 p99 上升超过允许比例时返回说明
+    """
+    failures = []
+    for name, current in result["scenarios"].items():
+        base = baseline.get("scenarios", {}).get(name)
+        if not base:
+            continue
+        if base["rps"] and current["rps"] < base["rps"] * (1 - max_regression):
+            failures.append(f"{name}: rps {current['rps']} < 基线 {base['rps']}")
+        if base["p99_ms"] and current["p99_ms"] > base["p99_ms"] * (1 + max_regression):
+            failures.append(f"{name}: p99 {current['p99_ms']}ms > 基线 {base['p99_ms']}ms")
+    return failures
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", help="压测已启动的服务，为空时在进程内启动应用")
+    parser.add_argument("--users", type=int, default=1000, help="写入的 sys_user 行数")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=10, help="每个场景持续的秒数")
+    parser.add_argument("--scenarios", nargs="+", default=["login", "register", "info", "list"])
+    parser.add_argument("--tokens", type=int, default=50, help="认证场景使用的 token 数量")
+    parser.add_argument("--output", help="结果输出文件")
+    parser.add_argument("--baseline", help="基线结果文件")
+    parser.add_argument("--max-regression", type=float, default=0.1)
+    args = parser.parse_args()
+
+    usernames = await seed(args.users)
+    result = {"users": args.users, "database": init_engine().dialect.name, "scenarios": {}}
+
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, timeout=30)
+        lifespan = None
+    else:
+        app = create_app()
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://benchmark", timeout=30)
+        lifespan = app.router.lifespan_context(app)
+        await lifespan.__aenter__()
+
+    try:
+        async with client:
+            authed = {"info", "list"} & set(args.scenarios)
+            tokens = await login_tokens(client, usernames, args.tokens) if authed else []
+            for name in args.scenarios:
+                scenario = Scenario(name, usernames, tokens)
+                result["scenarios"][name] = await run_scenario(client, scenario, args.concurrency, args.duration)
+    finally:
+        if lifespan is not None:
+            await lifespan.__aexit__(None, None, None)
+        await init_engine().dispose()
+
+    output = json.dumps(result, ensure_ascii=False, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            failures = compare(result, json.load(f), args.max_regression)
+        if failures:
+            print("\n".join(failures), file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
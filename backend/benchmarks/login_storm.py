@@ -0,0 +1,76 @@
+"""
+登录风暴下的事件循环延迟基准测试
+
+模拟一批并发登录（bcrypt 校验）的同时，用一个探针协程不断执行极短的任务，
+探针的延迟即代表同一 worker 中其它无关接口在登录风暴期间的响应延迟。
+分别测试同步哈希（改造前）与哈希执行器（改造后）两种模式。
+
+用法（在 backend 目录下执行）:
+    python -m benchmarks.login_storm --logins 50 --workers 4
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from app.models.user import User
+from app.utils.password_hasher import PasswordHasher
+
+
+async def probe(stop: asyncio.Event, samples: list, interval: float = 0.001):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        samples.append(time.perf_counter() - start - interval)
+
+
+async def blocking_login(password: str, hashed: str):
+    User.verify_password(password, hashed)
+
+
+async def run(mode: str, logins: int, hasher: PasswordHasher, hashed: str) -> dict:
+    samples = []
+    stop = asyncio.Event()
+    probe_task = asyncio.create_task(probe(stop, samples))
+    await asyncio.sleep(0.05)
+
+    start = time.perf_counter()
+    if mode == "sync":
+        tasks = [blocking_login("benchmark", hashed) for _ in range(logins)]
+    else:
+        tasks = [hasher.verify("benchmark", hashed) for _ in range(logins)]
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    await probe_task
+    samples.sort()
+    return {
+        "mode": mode,
+        "logins": logins,
+        "rejected": sum(isinstance(r, Exception) for r in results),
+        "elapsed_s": round(elapsed, 3),
+        "probe_p50_ms": round(statistics.median(samples) * 1000, 3),
+        "probe_p99_ms": round(samples[int(len(samples) * 0.99) - 1] * 1000, 3),
+        "probe_max_ms": round(samples[-1] * 1000, 3),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--pending", type=int, default=64)
+    parser.add_argument("--executor", default="thread", choices=["thread", "process"])
+    args = parser.parse_args()
+
+    hashed = User.get_password_hash("benchmark")
+    hasher = PasswordHasher(args.executor, args.workers, args.pending)
+    for mode in ("sync", "executor"):
+        print(await run(mode, args.logins, hasher, hashed))
+    print(hasher.stats())
+    hasher.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
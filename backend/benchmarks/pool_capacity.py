@@ -0,0 +1,70 @@
+"""
+连接池承载能力基准测试
+
+模拟请求：一次查询后进行一段不需要数据库的耗时处理（密码哈希、响应序列化、慢客户端等）。
+hold 模式在整个请求期间占用连接（改造前 db_getter 的行为），release 模式查询后立即归还连接。
+对每种连接池大小统计在给定超时内能完成的并发请求数与吞吐。
+
+默认使用本地 SQLite（需要安装 aiosqlite），也可通过 DATABASE_URL 指向测试用 MySQL
+
+用法（在 backend 目录下执行）:
+    python -m benchmarks.pool_capacity --concurrency 100 --work-ms 200 --pool-sizes 2 5 10
+"""
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.config import settings
+from app.core.dependencies.database import release_session
+
+
+async def handle(factory: async_sessionmaker, mode: str, work: float) -> bool:
+    try:
+        async with factory() as session:
+            await session.execute(text("SELECT 1"))
+            if mode == "release":
+                await release_session(session)
+            await asyncio.sleep(work)
+            await release_session(session)
+        return True
+    except PoolTimeoutError:
+        return False
+
+
+async def run(pool_size: int, mode: str, concurrency: int, work: float, timeout: float) -> dict:
+    engine = create_async_engine(settings.database_url, pool_size=pool_size, max_overflow=0, pool_timeout=timeout)
+    factory = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    start = time.perf_counter()
+    results = await asyncio.gather(*[handle(factory, mode, work) for _ in range(concurrency)])
+    seconds = time.perf_counter() - start
+    await engine.dispose()
+    return {
+        "pool_size": pool_size,
+        "mode": mode,
+        "concurrency": concurrency,
+        "succeeded": sum(results),
+        "timed_out": concurrency - sum(results),
+        "seconds": round(seconds, 3),
+        "rps": round(sum(results) / seconds, 1),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--work-ms", type=float, default=200)
+    parser.add_argument("--pool-timeout", type=float, default=1.0)
+    parser.add_argument("--pool-sizes", type=int, nargs="+", default=[2, 5, 10])
+    args = parser.parse_args()
+
+    for pool_size in args.pool_sizes:
+        for mode in ("hold", "release"):
+            print(await run(pool_size, mode, args.concurrency, args.work_ms / 1000, args.pool_timeout))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,58 @@
+"""
+热点接口查询计划检查（可用于 CI）
+
+开启查询计划检查后在进程内调用注册、登录、获取用户信息接口，
+对这些请求执行过的每种 SELECT 语句执行 EXPLAIN，输出全表扫描、文件排序与临时表及发出语句的 DAL 方法，
+存在问题时以非零状态码退出。默认使用本地 SQLite 文件，也可通过 DATABASE_URL 指向一次性的本地 MySQL
+（数据表会被删除重建，库名需带有 test 或 bench 分段，如 bench_db）。
+
+用法（在 backend 目录下执行，先安装 benchmarks/requirements.txt）:
+    python -m benchmarks.query_plans --users 1000
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+os.environ["QUERY_ADVISOR_ENABLE"] = "true"
+# 认证用户缓存会跳过查询，关闭性能分析日志以免干扰输出
+os.environ.setdefault("USER_CACHE_TTL", "0")
+os.environ.setdefault("PROFILE_ENABLE", "false")
+
+import httpx  # noqa: E402
+
+from app.app import create_app  # noqa: E402
+from app.config import settings  # noqa: E402
+from app.core.dependencies.database import init_engine  # noqa: E402
+from app.utils.query_advisor import query_advisor  # noqa: E402
+from benchmarks.loadtest import PASSWORD, seed  # noqa: E402
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=1000, help="写入的 sys_user 行数，行数过少时数据库可能直接选择全表扫描")
+    args = parser.parse_args()
+
+    usernames = await seed(args.users)
+    # 只检查接口请求中的查询
+    query_advisor.shapes.clear()
+
+    app = create_app()
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+            prefix = settings.prefix
+            await client.post(f"{prefix}/user/register",
+                              json={"username": "plan_check", "fullname": "plan_check", "password": PASSWORD})
+            response = await client.post(f"{prefix}/user/login",
+                                         json={"username": usernames[-1], "password": PASSWORD})
+            await client.get(f"{prefix}/user/info", headers={"token": response.json()["data"]["token"]})
+        findings = await query_advisor.analyze(init_engine())
+
+    print(json.dumps({"statements": len(query_advisor.shapes), "findings": findings}, ensure_ascii=False, indent=2))
+    return 1 if findings else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
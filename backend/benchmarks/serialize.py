@@ -0,0 +1,45 @@
+"""
+列表序列化微基准测试，对比逐行 await serialize 与批量 serialize_datas
+
+用法（在 backend 目录下执行）:
+    python -m benchmarks.serialize --rows 10000
+"""
+import argparse
+import asyncio
+import time
+
+from app.crud.user import UserDal
+from app.models.user import User
+from benchmarks import build_rows
+
+
+async def per_row(dal: UserDal, rows: list[User]) -> list[dict]:
+    return [await dal.serialize(obj) for obj in rows]
+
+
+async def batch(dal: UserDal, rows: list[User]) -> list[dict]:
+    return dal.serialize_datas(rows)
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    dal = UserDal(None)
+    rows = [User(id=i, **row) for i, row in enumerate(build_rows(args.rows), 1)]
+    assert await per_row(dal, rows) == dal.serialize_datas(rows)
+
+    for func in (per_row, batch):
+        best = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            await func(dal, rows)
+            best = min(best, time.perf_counter() - start)
+        print({"mode": func.__name__, "rows": args.rows, "best_ms": round(best * 1000, 2),
+               "rows_per_s": round(args.rows / best)})
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
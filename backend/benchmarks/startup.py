@@ -0,0 +1,99 @@
+"""
+启动与首个请求耗时基准测试
+
+每次测量都在新的子进程中进行（冷启动），分别统计：
+    import   导入 main 模块（create_app）的耗时，此时不应建立任何数据库连接
+    startup  执行 lifespan 启动阶段的耗时（创建引擎，开启预热时还包括连接、哈希、校验器预热）
+    first    启动完成后第一个登录请求的耗时
+对比关闭预热（STARTUP_WARM_UP=false）与开启预热两种情况。
+
+用法（在 backend 目录下执行）:
+    python -m benchmarks.startup --runs 5
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks import reset_schema
+
+USERNAME = "startup_bench"
+PASSWORD = "startup_bench_pwd"
+
+
+async def seed() -> None:
+    from app.core.dependencies.database import dispose_engine, session_factory
+    from app.crud.user import UserDal
+    from app.models.user import User
+    from app.utils.password_hasher import password_hasher
+    await reset_schema(drop=False)
+    async with session_factory() as session:
+        if not await UserDal(session).get_data(username=USERNAME, v_return_none=True):
+            session.add(User(username=USERNAME, password=await password_hasher.hash(PASSWORD),
+                             fullname=USERNAME))
+            await session.commit()
+    password_hasher.shutdown()
+    await dispose_engine()
+
+
+async def measure() -> dict:
+    import httpx
+    start = time.perf_counter()
+    from main import app
+    imported = time.perf_counter()
+
+    from app.core.dependencies import database
+    result = {"import": imported - start, "engine_at_import": database.async_engine is not None}
+    async with app.router.lifespan_context(app):
+        started = time.perf_counter()
+        result["startup"] = started - imported
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+            begin = time.perf_counter()
+            response = await client.post("/api/user/login", json={"username": USERNAME, "password": PASSWORD})
+            result["first"] = time.perf_counter() - begin
+            result["status"] = response.status_code
+    return result
+
+
+def run_child(warm_up: bool) -> dict:
+    env = dict(os.environ, STARTUP_WARM_UP=str(warm_up).lower())
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.startup", "--child"],
+        env=env, check=True, capture_output=True, text=True
+    ).stdout
+    # 子进程的日志同样输出到 stdout，最后一行为测量结果
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(asyncio.run(measure())))
+        return
+
+    asyncio.run(seed())
+    summary = {}
+    for warm_up in (False, True):
+        runs = [run_child(warm_up) for _ in range(args.runs)]
+        summary["warm_up" if warm_up else "cold"] = {
+            "engine_at_import": any(run["engine_at_import"] for run in runs),
+            "status": sorted({run["status"] for run in runs}),
+            **{
+                f"{key}_ms": round(statistics.median(run[key] for run in runs) * 1000, 2)
+                for key in ("import", "startup", "first")
+            }
+        }
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
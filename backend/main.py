@@ -3,6 +3,14 @@ from app.app import create_app
 app = create_app()
 
 if __name__ == '__main__':
-    import uvicorn
+    import argparse
 
-    uvicorn.run(app, host='0.0.0.0', port=8000)
+    from app.core.server import serve
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host")
+    parser.add_argument("--port", type=int)
+    parser.add_argument("--workers", type=int, help="工作进程数，默认读取配置，0 表示与 CPU 核数相同")
+    args = parser.parse_args()
+
+    serve("main:app", host=args.host, port=args.port, workers=args.workers)
@@ -35,6 +35,7 @@ sys.path.append(BASE_DIR)
 
 # 导入项目中的基本映射类，与 需要迁移的 ORM 模型
 from app.models.user import *
+from app.models.audit import *
 
 # 修改配置中的参数
 target_metadata = Base.metadata
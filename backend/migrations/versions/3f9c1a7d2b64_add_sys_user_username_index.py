@@ -0,0 +1,47 @@
+"""add sys_user username index
+
+登录与认证按 (username, is_delete) 查询用户，查询计划检查报告为全表扫描。
+各环境的迁移版本由 autogenerate 在本地生成（versions 目录未纳入版本管理），
+本迁移作为独立分支提供，表不存在或索引已存在时跳过，执行 alembic upgrade heads 应用。
+
+Revision ID: 3f9c1a7d2b64
+Revises:
+Create Date: 2026-10-18 16:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9c1a7d2b64'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = ('query_indexes',)
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEX_NAME = "ix_sys_user_username_is_delete"
+TABLE_NAME = "sys_user"
+
+
+def index_exists() -> bool | None:
+    """
+    :return: 表不存在时返回 None
+    """
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table(TABLE_NAME):
+        return None
+    return any(index["name"] == INDEX_NAME for index in inspector.get_indexes(TABLE_NAME))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if index_exists() is False:
+        op.create_index(INDEX_NAME, TABLE_NAME, ["username", "is_delete"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if index_exists():
+        op.drop_index(INDEX_NAME, table_name=TABLE_NAME)
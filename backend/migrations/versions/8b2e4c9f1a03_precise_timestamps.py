@@ -0,0 +1,49 @@
+"""precise created_at / updated_at on mysql
+
+条件请求（ETag）的数据版本取 max(updated_at)，MySQL 的 DATETIME 默认只精确到秒，
+同一秒内的多次修改会得到相同的版本，改为 DATETIME(6)。其它数据库无需修改。
+与 3f9c1a7d2b64 同属 query_indexes 分支，表不存在时跳过，执行 alembic upgrade heads 应用。
+
+Revision ID: 8b2e4c9f1a03
+Revises: 3f9c1a7d2b64
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b2e4c9f1a03'
+down_revision: Union[str, Sequence[str], None] = '3f9c1a7d2b64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ("sys_user", "sys_operation_record")
+COLUMNS = (("created_at", "创建时间"), ("updated_at", "更新时间"))
+
+
+def alter(type_) -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "mysql":
+        return
+    inspector = sa.inspect(bind)
+    for table in TABLES:
+        if not inspector.has_table(table):
+            continue
+        for column, comment in COLUMNS:
+            op.alter_column(table, column, type_=type_, existing_nullable=False, comment=comment,
+                            existing_comment=comment)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    alter(mysql.DATETIME(fsp=6))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    alter(mysql.DATETIME())